@@ -6,6 +6,9 @@ from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
 
+from basecalc import core, expr, fixed, shift, validate
+from basecalc.cache import conversions
+
 kivy.require('2.0.0')
 
 
@@ -28,6 +31,10 @@ class BaseCalculatorApp(App):
         # モード一覧とインデックス
         self.modes = [2, 3, 4, 5]
         self.mode_index = 0
+        # 直前の整数の結果（基数を変えたら新しい基数で表示し直す）
+        self.last_value = None
+        # 直前の結果の表記（shift で求めた結果は値を持たず、これだけを覚える）
+        self.last_text = None
         self.mode = self.modes[self.mode_index]  # 初期モード: 2進数
 
         # レイアウト準備
@@ -63,24 +70,27 @@ class BaseCalculatorApp(App):
         clear_btn = Button(text="Clear", size_hint=(None, 0.4), width=150)
         clear_btn.bind(on_press=self.clear_fields)
 
-        # モード／クリアボタンを横並びに配置
+        # 小数点以下の桁数（空または 0 なら整数の切り捨て除算）
+        self.precision_input = TextInput(
+            hint_text="Precision", input_filter="int",
+            multiline=False, font_size=20, size_hint=(None, 0.4), width=150
+        )
+
+        # モード／クリアボタン／精度を横並びに配置
         btn_layout = BoxLayout(size_hint=(1, 0.4), spacing=10)
         btn_layout.add_widget(mode_btn)
         btn_layout.add_widget(clear_btn)
+        btn_layout.add_widget(self.precision_input)
+
+        # 1つ目の入力欄の式（例: (1011 XOR 110) * 21）を計算するボタン
+        eval_btn = Button(text="=", size_hint=(None, 0.4), width=80)
+        eval_btn.bind(on_press=self.evaluate_expression)
+        btn_layout.add_widget(eval_btn)
 
         # 演算ボタン群
         ops_layout = BoxLayout(size_hint=(1, 0.6), spacing=5)
-        buttons = [
-            ('+', 'add'),
-            ('−', 'subtract'),
-            ('×', 'multiply'),
-            ('÷', 'divide'),
-            ('AND', 'and'),
-            ('OR', 'or'),
-            ('XOR', 'xor')
-        ]
-        for label, op in buttons:
-            btn = Button(text=label, font_size=20)
+        for op in core.OPERATORS.values():
+            btn = Button(text=op.symbol, font_size=20)
             btn.bind(on_press=lambda inst, o=op: self.calculate(o))
             ops_layout.add_widget(btn)
 
@@ -96,99 +106,93 @@ class BaseCalculatorApp(App):
 
     def toggle_mode(self, *args):
         # 2→3→4→5→2 の循環
+        old_base = self.base_map[self.mode]
         self.mode_index = (self.mode_index + 1) % len(self.modes)
         self.mode = self.modes[self.mode_index]
+        base = self.base_map[self.mode]
 
         base_name = self.mode_text[self.mode]
         self.mode_label.text = f"Mode: {base_name}"
         self.entry1.hint_text = base_name
         self.entry2.hint_text = base_name
-        self.result_label.text = "Result: "
+        # 整数の入力と結果は値を保ったまま新しい基数で表示し直す
+        self.entry1.text = self.rebase_text(self.entry1.text, old_base, base)
+        self.entry2.text = self.rebase_text(self.entry2.text, old_base, base)
+        if self.last_value is not None:
+            text = conversions.format_int(self.last_value, base)
+        else:
+            # 表記だけの結果はここで値に直す（小数の結果は消す）
+            text = self.rebase_text(self.last_text or "", old_base, base)
+        self.result_label.text = f"Result: {text}"
+
+    def rebase_text(self, s, old_base, base):
+        """old_base 進数の整数 s を base 進数で表す（整数でなければ空にする）"""
+        try:
+            s = validate.check(s, old_base, sign=True)
+        except ValueError:
+            return ""
+        return conversions.format_int(conversions.parse_int(s, old_base), base)
 
     def clear_fields(self, *args):
         """入力欄と結果表示をクリア"""
         self.entry1.text = ""
         self.entry2.text = ""
         self.result_label.text = "Result: "
+        self.last_value = None
+        self.last_text = None
 
     def validate_input(self, s):
-        """各モードの許可文字チェック"""
-        s = s.strip().upper()
-        if not s:
-            return False
-
-        allowed_chars = {
-            2: '01',
-            3: '012',
-            4: '0123456789',
-            5: '0123456789AB'
-        }
-        return all(c in allowed_chars[self.mode] for c in s)
+        """各モードの許可文字チェック。前後の空白を除いた入力を返す
+
+        不正な文字があれば、その位置を添えて ValueError を送出する。
+        """
+        base = self.base_map[self.mode]
+        try:
+            return validate.check(s, base, point=self.precision > 0)
+        except ValueError as e:
+            raise ValueError(f"Invalid input for current mode: {e}") from None
+
+    @property
+    def precision(self):
+        return int(self.precision_input.text or 0)
 
     def convert_to_decimal(self, s):
         """モードに応じて10進数に変換"""
-        if not self.validate_input(s):
-            raise ValueError("Invalid input for current mode.")
-
+        s = self.validate_input(s)
         base = self.base_map[self.mode]
-        return int(s.strip().upper(), base)
+        if self.precision > 0:
+            return fixed.parse_value(s, base)
+        return conversions.parse_int(s, base)
 
     def convert_from_decimal(self, n):
         """10進数をモードの基数文字列に変換"""
-        sign = '-' if n < 0 else ''
-        n = abs(n)
         base = self.base_map[self.mode]
-
-        if base == 2:
-            return sign + bin(n)[2:]
-        if base == 3:
-            if n == 0:
-                return '0'
-            digits = []
-            while n:
-                digits.append(str(n % 3))
-                n //= 3
-            return sign + ''.join(reversed(digits))
-        if base == 10:
-            return sign + str(n)
-        # base == 12
-        if n == 0:
-            return '0'
-        digits = []
-        while n:
-            r = n % 12
-            if r < 10:
-                digits.append(str(r))
-            else:
-                digits.append(chr(ord('A') + r - 10))
-            n //= 12
-        return sign + ''.join(reversed(digits))
+        return conversions.format_int(n, base)
 
     def calculate(self, operation):
+        """operation は core.OPERATORS の項目"""
         try:
-            a = self.convert_to_decimal(self.entry1.text)
-            b = self.convert_to_decimal(self.entry2.text)
-
-            if operation == 'add':
-                res = a + b
-            elif operation == 'subtract':
-                res = a - b
-            elif operation == 'multiply':
-                res = a * b
-            elif operation == 'divide':
-                if b == 0:
-                    raise ZeroDivisionError("Division by zero.")
-                res = a // b
-            elif operation == 'and':
-                res = a & b
-            elif operation == 'or':
-                res = a | b
-            elif operation == 'xor':
-                res = a ^ b
+            base = self.base_map[self.mode]
+            if self.precision > 0:
+                a = self.convert_to_decimal(self.entry1.text)
+                b = self.convert_to_decimal(self.entry2.text)
+                res = fixed.apply(operation.name, a, b, base)
+                out = fixed.format_value(res, base, self.precision)
+                self.last_value = res if isinstance(res, int) else None
             else:
-                raise ValueError("Unknown operation.")
-
-            out = self.convert_from_decimal(res)
+                # 基数のべきとの掛け算・割り算などは、int への変換も計算もせず
+                # 入力の桁の操作で表記を求める（不正な文字があれば None）
+                out = shift.calculate(operation.name, self.entry1.text.strip(),
+                                      self.entry2.text.strip(), base)
+                if out is None:
+                    a = self.convert_to_decimal(self.entry1.text)
+                    b = self.convert_to_decimal(self.entry2.text)
+                    res = core.apply(operation.name, a, b, base)
+                    out = self.convert_from_decimal(res)
+                    self.last_value = res
+                else:
+                    self.last_value = None
+            self.last_text = out
             self.result_label.text = f"Result: {out}"
 
         except ZeroDivisionError as e:
@@ -196,6 +200,20 @@ class BaseCalculatorApp(App):
         except ValueError as e:
             self.show_error(str(e))
 
+    def evaluate_expression(self, *args):
+        """1つ目の入力欄を式として現在のモードの基数で計算する"""
+        base = self.base_map[self.mode]
+        try:
+            e = expr.compile(self.entry1.text, base, exact=self.precision > 0)
+            res = e.evaluate()
+            self.last_value = res if isinstance(res, int) else None
+            self.last_text = e.format(res, self.precision)
+            self.result_label.text = f"Result: {self.last_text}"
+        except ZeroDivisionError as e:
+            self.show_error(str(e))
+        except ValueError as e:
+            self.show_error(str(e))
+
     def show_error(self, msg):
         popup = Popup(
             title='Error',
@@ -1,37 +1,345 @@
 import sys
+from concurrent.futures import CancelledError, Future
 from functools import partial
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QPalette, QColor
+from PyQt5.QtCore import Qt, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QFontMetrics, QKeySequence, QPalette, QColor
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-    QLabel, QPushButton, QMessageBox, QStyleFactory, QSizePolicy
+    QLabel, QPushButton, QMessageBox, QStyleFactory, QSizePolicy, QSpinBox,
+    QMenu, QFileDialog, QDialog, QCheckBox, QPlainTextEdit
 )
 
+from basecalc import (backend, core, expr, fileio, fixed, instrument, parallel,
+                      radix, shift)
+from basecalc.cache import conversions
+from basecalc.operand import Operand
+from basecalc.state import CalcState
+
+# これ以上のビット数の計算・変換は UI スレッドの外（QThreadPool）で行う
+ASYNC_BITS = 1 << 15
+
+# 言語ごとのボタンの表示
+# （演算子は basecalc.core の表から取る）
+LABELS = {
+    lang: {
+        **{d: d for d in radix.DIGITS + "."},
+        **{name: op.labels[lang] for name, op in core.OPERATORS.items()},
+        "clear": "C", "back": "⌫", "equal": equal,
+    }
+    for lang, equal in (("EN", "="), ("JP", "＝"))
+}
+
+PRECISION_TIPS = {
+    "EN": "Fractional digits (0 = integer division)",
+    "JP": "小数点以下の桁数（0 で整数の割り算）",
+}
+
+# テーマごとの色
+THEMES = {
+    "dark": {
+        "bg": "#121212", "text": "white", "digit_bg": "#2D2D2D",
+        "func_bg": "#374955", "eq_bg": "#004C69", "clr_bg": "#484264",
+        "decimal_bg": "#1A1A1A", "decimal_text": "#B0B0B0",
+        "disabled_bg": "#1A1A1A", "disp_bg": "#1F1F1F",
+    },
+    "light": {
+        "bg": "#FFFFFF", "text": "black", "digit_bg": "#E0E0E0",
+        "func_bg": "#D2E5F4", "eq_bg": "#C2E8FF", "clr_bg": "#E5DEFF",
+        "decimal_bg": "#F5F5F5", "decimal_text": "#666666",
+        "disabled_bg": "#F0F0F0", "disp_bg": "#FFFFFF",
+    },
+}
+
+# アプリ全体のスタイルシート。ボタンの種類・現在の基数は動的プロパティで選ぶので、
+# 基数を切り替えてもスタイルシートを作り直す必要はない
+STYLESHEET = """
+QLabel#display {{
+    background: {disp_bg};
+    color: {text};
+    border-radius: 12px;
+    padding-right: 16px;
+}}
+QLabel#decimal_bar {{
+    background: {decimal_bg};
+    color: {decimal_text};
+    border-radius: 8px;
+    padding-right: 16px;
+    padding-left: 16px;
+    border: 1px solid {decimal_text}40;
+}}
+QPushButton[type="digit"], QPushButton[type="func"], QPushButton[type="op"] {{
+    color: {text};
+    border-radius: 36px;
+}}
+QPushButton[type="digit"] {{ background-color: {digit_bg}; }}
+QPushButton[type="digit"]:pressed {{ background-color: {digit_bg}CC; }}
+QPushButton[type="digit"]:disabled {{
+    background-color: {disabled_bg};
+    color: {decimal_text};
+}}
+QPushButton[type="func"], QPushButton[type="op"] {{ background-color: {func_bg}; }}
+QPushButton[type="func"]:pressed, QPushButton[type="op"]:pressed {{
+    background-color: {func_bg}CC;
+}}
+QPushButton#equal {{ background-color: {eq_bg}; }}
+QPushButton#equal:pressed {{ background-color: {eq_bg}CC; }}
+QPushButton#clear {{ background-color: {clr_bg}; }}
+QPushButton#clear:pressed {{ background-color: {clr_bg}CC; }}
+QPushButton[type="base"] {{
+    background-color: {func_bg};
+    color: {text};
+    border-radius: 12px;
+}}
+QPushButton[type="base"]:pressed {{ background-color: {func_bg}CC; }}
+QPushButton[type="base"][current="true"] {{ background-color: {eq_bg}; }}
+QPushButton[type="base"][current="true"]:pressed {{ background-color: {eq_bg}CC; }}
+"""
+
+# テーマ名 -> (スタイルシート, パレット)。初めて使うときに一度だけ作る
+_theme_cache = {}
+
+
+def compiled_theme(theme):
+    if theme not in _theme_cache:
+        colors = THEMES[theme]
+        pal = QPalette()
+        pal.setColor(QPalette.Window, QColor(colors["bg"]))
+        pal.setColor(QPalette.WindowText, QColor(colors["text"]))
+        pal.setColor(QPalette.Base, QColor(colors["bg"]))
+        pal.setColor(QPalette.Text, QColor(colors["text"]))
+        _theme_cache[theme] = (STYLESHEET.format(**colors), pal)
+    return _theme_cache[theme]
+
+
+def repolish(widget):
+    """動的プロパティを変えたウィジェットにだけスタイルを当て直す"""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+class Task(QRunnable):
+    """QThreadPool で func(*args, cancelled) を実行し、結果を Future に入れる"""
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.future = Future()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+        self.future.cancel()
+
+    def cancelled(self):
+        return self._cancelled
+
+    def run(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.func(*self.args, self.cancelled)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+def _result_task(r, base, text, size, cancelled):
+    # 結果の Operand を作る。表記がなければ全桁は変換せず、表示欄に入る
+    # 上位・下位 size = (head, tail) 桁と桁数だけをこのスレッドで求めておく
+    if cancelled():
+        raise CancelledError
+    result = Operand.from_value(base, r, text)
+    if text is None:
+        result.preview(base, *size)
+    return result
+
+
+def _calculate_task(op, x, y, base, text, size, cancelled):
+    r = core.apply(op, x, y, base)
+    return _result_task(r, base, text, size, cancelled)
+
+
+def _fixed_task(op, x, y, base, precision, cancelled):
+    r = fixed.apply(op, x, y, base)
+    if cancelled():
+        raise CancelledError
+    return r, fixed.format_value(r, base, precision)
+
+
+def _import_task(path, file_base, base, size, cancelled):
+    r = fileio.read_number(path, file_base)
+    return _result_task(r, base, None, size, cancelled)
+
+
+def _preview_task(value, bases, head, tail, cancelled):
+    previews = {}
+    for base in bases:
+        if cancelled():
+            raise CancelledError
+        previews[base] = radix.preview(abs(value), base, head, tail)
+    return previews
+
+
+def _elide(sign, head, tail):
+    # 上位桁…下位桁（桁数が少なければ tail は空）
+    return f"{sign}{head}…{tail}" if tail else sign + head
+
+
+def _operand_parts(operand, size):
+    # (先頭側の文字列, 末尾側の文字列, 表記の長さ)。表記がまだない値は全桁を
+    # 変換せず、上位・下位 size = (head, tail) 桁だけを求める
+    if operand.rendered:
+        text = operand.text
+        return text, text, len(text)
+    sign = "-" if operand.negative else ""
+    top, low, count = operand.preview(operand.base, *size)
+    return sign + top, low or sign + top, len(sign) + count
+
+
+def _elide_parts(parts, n):
+    # 先頭側と末尾側から n 文字以内（中ほどを「…」で省く）の文字列にする
+    top, low, length = parts
+    if length <= n:
+        return top
+    if n <= 1:
+        return "…"
+    head = (n - 1) // 2
+    tail = n - 1 - head
+    return f"{top[:head]}…{low[len(low) - tail:]}"
+
+
+def _split_budget(x, y, budget):
+    # 短い方は省かずに見せ、残りを長い方に回す（どちらにも1文字は残す）
+    if x + y <= budget:
+        return x, y
+    half = budget // 2
+    if x <= half:
+        return x, budget - x
+    if y <= budget - half:
+        return budget - y, y
+    return half, budget - half
+
+
+class DebugPanel(QDialog):
+    """計測（basecalc.instrument）の切り替えと統計の表示・書き出し（Ctrl+Shift+D）"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Debug")
+        self.resize(520, 560)
+        vbox = QVBoxLayout(self)
+
+        switches = QHBoxLayout()
+        self.check_timers = QCheckBox("Instrumentation")
+        self.check_timers.setChecked(instrument.enabled())
+        self.check_timers.toggled.connect(self.set_timers)
+        self.check_profile = QCheckBox("cProfile (UI thread)")
+        self.check_profile.setChecked(instrument.profiling())
+        self.check_profile.toggled.connect(self.set_profile)
+        switches.addWidget(self.check_timers)
+        switches.addWidget(self.check_profile)
+        switches.addStretch()
+        vbox.addLayout(switches)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setFont(QFont("Menlo", 11))
+        vbox.addWidget(self.view)
+
+        buttons = QHBoxLayout()
+        for label, slot in (("Reset", self.reset), ("Save JSON…", self.save_json),
+                            ("Save profile…", self.save_profile)):
+            btn = QPushButton(label)
+            btn.clicked.connect(slot)
+            buttons.addWidget(btn)
+        vbox.addLayout(buttons)
+
+        # 開いている間は1秒ごとに表示を更新する
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(1000)
+        self.refresh()
+
+    def stats(self):
+        data = instrument.snapshot()
+        data["backend"] = backend.get().name
+        data["conversion_cache"] = conversions.stats()
+        return data
+
+    def refresh(self):
+        import json  # 起動を遅くしないよう、デバッグ画面を開いてから読み込む
+
+        text = json.dumps(self.stats(), indent=1, ensure_ascii=False)
+        if instrument.profiling():
+            text += "\n\n" + instrument.profile_report(20)
+        self.view.setPlainText(text)
+
+    def set_timers(self, on):
+        if on:
+            instrument.enable()
+        else:
+            instrument.disable()
+        self.refresh()
+
+    def set_profile(self, on):
+        if on:
+            instrument.start_profile()
+        else:
+            instrument.stop_profile()
+        self.refresh()
+
+    def reset(self):
+        instrument.reset()
+        self.refresh()
+
+    def save_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save JSON", "stats.json",
+                                              "JSON (*.json)")
+        if path:
+            data = self.stats()
+            instrument.dump_json(path, {key: data[key] for key in
+                                        ("backend", "conversion_cache")})
+
+    def save_profile(self):
+        if not instrument.has_profile():
+            QMessageBox.information(self, "Debug", "Turn on cProfile first.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save profile", "run.prof",
+                                              "pstats (*.prof)")
+        if path:
+            instrument.dump_profile(path)
+
 
 class BaseCalculator(QWidget):
+    # 別スレッド・別プロセスでの計算や変換が終わったとき（引数は Future）
+    job_finished = pyqtSignal(object)
+    render_finished = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Base-Cl Calculator")
         self.setFixedSize(360, 740)  # 高さを少し増加
 
-        self.reset_state()
         self.current_theme = "dark"    # dark / light
         self.current_lang = "EN"       # EN / JP
-        self.current_base = 2          # 2, 3, 10, 12
+        # 基数（2, 3, 10, 12）・オペランド・演算子・直前の結果
+        self.state = CalcState(2)
+
+        # 計算中の Future と、その中断用の関数（大きなオペランドのときだけ）
+        self._pending = None
+        self._cancel_pending = None
+        self._debug_panel = None
+        self.job_finished.connect(self.on_job_finished)
+        self.render_finished.connect(self.on_render_finished)
 
+        QApplication.setStyle(QStyleFactory.create("Fusion"))
+        # 起動時は現在のテーマと言語の分だけ用意する
+        # （他方のテーマや言語は切り替えたときに初めて作る）
         self._init_ui()
         self.apply_theme()
-        self.apply_language()
-
-    def reset_state(self, keep_result=False):
-        if keep_result:
-            # preserve the result as operand1, clear everything else
-            self.operand1 = self.last_result
-        else:
-            self.operand1 = ""
-        self.operand2 = ""
-        self.operator = None
-        self.editing_second = False
 
     def _init_ui(self):
         vbox = QVBoxLayout(self)
@@ -42,7 +350,7 @@ class BaseCalculator(QWidget):
         header = QHBoxLayout()
         header.setSpacing(12)
         self.btn_theme = QPushButton("🌙")
-        self.btn_lang = QPushButton("EN")
+        self.btn_lang = QPushButton(self.current_lang)
         for btn in (self.btn_theme, self.btn_lang):
             btn.setFont(QFont("Helvetica Neue", 16))
             btn.setFixedSize(48, 48)
@@ -51,6 +359,17 @@ class BaseCalculator(QWidget):
         header.addWidget(self.btn_theme)
         header.addWidget(self.btn_lang)
         header.addStretch()
+
+        # 小数点以下の桁数（0 なら従来どおり整数の切り捨て除算）
+        self.precision_box = QSpinBox()
+        self.precision_box.setFont(QFont("Helvetica Neue", 14))
+        self.precision_box.setRange(0, fixed.MAX_PRECISION)
+        self.precision_box.setPrefix(".")
+        self.precision_box.setFixedHeight(48)
+        self.precision_box.setValue(self.state.precision)
+        self.precision_box.setToolTip(PRECISION_TIPS[self.current_lang])
+        self.precision_box.valueChanged.connect(self.set_precision)
+        header.addWidget(self.precision_box)
         vbox.addLayout(header)
 
         # base-switcher buttons
@@ -61,6 +380,8 @@ class BaseCalculator(QWidget):
             btn = QPushButton(str(b))
             btn.setFont(QFont("Helvetica Neue", 14))
             btn.setFixedSize(60, 48)
+            btn.setProperty("type", "base")
+            btn.setProperty("current", b == self.state.base)
             btn.clicked.connect(partial(self.set_base, b))
             self.base_buttons[b] = btn
             base_layout.addWidget(btn)
@@ -69,14 +390,20 @@ class BaseCalculator(QWidget):
 
         # display
         self.display = QLabel("0")
+        self.display.setObjectName("display")
         self.display.setFont(QFont("Helvetica Neue", 40, QFont.Bold))
         self.display.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.display.setFixedHeight(100)
         self.display.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.display.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.display.customContextMenuRequested.connect(self.show_display_menu)
+        self._display_full = "0"
+        self._display_value = None
         vbox.addWidget(self.display)
 
         # 10進数変換表示バー
         self.decimal_bar = QLabel("")
+        self.decimal_bar.setObjectName("decimal_bar")
         self.decimal_bar.setFont(QFont("Helvetica Neue", 16))
         self.decimal_bar.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.decimal_bar.setFixedHeight(40)
@@ -100,20 +427,25 @@ class BaseCalculator(QWidget):
             ("1",        "1"),    ("2",        "2"),
             ("3",        "3"),    ("A",        "A"),
             ("0",        "0"),    ("B",        "B"),
+            (".",        "."),
         ]
         self.buttons = {}
+        labels = LABELS[self.current_lang]
         for idx, (key, _) in enumerate(keys):
-            btn = QPushButton()
+            btn = QPushButton(labels[key])
             btn.setFont(QFont("Helvetica Neue", 24))
             btn.setFixedSize(72, 72)
             btn.clicked.connect(partial(self.on_button, key))
             # classify button types for styling
-            if key.isdigit() or key in ("A", "B"):
+            if key.isdigit() or key in ("A", "B", "."):
                 btn.setProperty("type", "digit")
             elif key in ("clear", "back"):
                 btn.setProperty("type", "func")
             else:
                 btn.setProperty("type", "op")
+            if key in ("equal", "clear"):
+                btn.setObjectName(key)
+            btn.setEnabled(self.is_button_enabled(key))
             
             # 配置を調整：6行4列のレイアウト
             if idx < 16:  # 最初の4行（16個）
@@ -131,127 +463,53 @@ class BaseCalculator(QWidget):
                     r, c = 5, 0  # 新しい行の左端
                 elif idx == 21:  # "B"
                     r, c = 5, 1  # 新しい行の中央左
+                elif idx == 22:  # "."
+                    r, c = 5, 2  # 新しい行の中央右
             
             grid.addWidget(btn, r, c)
             self.buttons[key] = btn
 
         vbox.addLayout(grid)
 
-        # state for chaining calculation
-        self.last_result = ""
+        # 10進数変換バーは次のイベントループでまとめて更新する
+        self._bar_operand = None
+        self._bar_pending = False
+        self._bar_task = None
 
     # theme
     def toggle_theme(self):
         self.current_theme = "light" if self.current_theme == "dark" else "dark"
         self.apply_theme()
 
+    @instrument.timed("gui.apply_theme")
     def apply_theme(self):
-        QApplication.setStyle(QStyleFactory.create("Fusion"))
-        pal = QPalette()
-
-        if self.current_theme == "dark":
-            bg_color = "#121212"
-            text_color = "white"
-            digit_bg = "#2D2D2D"
-            func_bg = "#374955"
-            eq_bg = "#004C69"
-            clr_bg = "#484264"
-            decimal_bg = "#1A1A1A"
-            decimal_text = "#B0B0B0"
-            disabled_bg = "#1A1A1A"
-            self.btn_theme.setText("☀")
-        else:
-            bg_color = "#FFFFFF"
-            text_color = "black"
-            digit_bg = "#E0E0E0"
-            func_bg = "#D2E5F4"
-            eq_bg = "#C2E8FF"
-            clr_bg = "#E5DEFF"
-            decimal_bg = "#F5F5F5"
-            decimal_text = "#666666"
-            disabled_bg = "#F0F0F0"
-            self.btn_theme.setText("🌙")
-
-        pal.setColor(QPalette.Window, QColor(bg_color))
-        pal.setColor(QPalette.WindowText, QColor(text_color))
-        pal.setColor(QPalette.Base, QColor(bg_color))
-        pal.setColor(QPalette.Text, QColor(text_color))
+        stylesheet, pal = compiled_theme(self.current_theme)
+        self.btn_theme.setText("☀" if self.current_theme == "dark" else "🌙")
         QApplication.setPalette(pal)
+        QApplication.instance().setStyleSheet(stylesheet)
 
-        # display styling
-        disp_bg = "#1F1F1F" if self.current_theme == "dark" else "#FFFFFF"
-        self.display.setStyleSheet(f"""
-            QLabel {{
-                background: {disp_bg};
-                color: {text_color};
-                border-radius: 12px;
-                padding-right: 16px;
-            }}
-        """)
-
-        # decimal bar styling
-        self.decimal_bar.setStyleSheet(f"""
-            QLabel {{
-                background: {decimal_bg};
-                color: {decimal_text};
-                border-radius: 8px;
-                padding-right: 16px;
-                padding-left: 16px;
-                border: 1px solid {decimal_text}40;
-            }}
-        """)
-
-        # grid buttons styling
+    def update_base_buttons(self, old_base):
+        """基数の切り替えで変わったボタンだけを更新する"""
+        for b in (old_base, self.state.base):
+            btn = self.base_buttons[b]
+            btn.setProperty("current", b == self.state.base)
+            repolish(btn)
+        # :disabled の見た目は状態の変化に合わせて Qt が描き直す
         for key, btn in self.buttons.items():
-            # ボタンが現在の基数で有効かどうかチェック
-            is_enabled = self.is_button_enabled(key)
-            
-            if key == "equal":
-                bg = eq_bg
-            elif key == "clear":
-                bg = clr_bg
-            elif not is_enabled:
-                bg = disabled_bg
-            elif btn.property("type") == "digit":
-                bg = digit_bg
-            else:
-                bg = func_bg
-
-            btn.setEnabled(is_enabled)
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {bg};
-                    color: {text_color if is_enabled else decimal_text};
-                    border-radius: 36px;
-                }}
-                QPushButton:pressed {{
-                    background-color: {bg}CC;
-                }}
-            """)
-
-        # base-switcher buttons styling
-        for b, btn in self.base_buttons.items():
-            # highlight current base with eq_bg
-            bg = eq_bg if b == self.current_base else func_bg
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {bg};
-                    color: {text_color};
-                    border-radius: 12px;
-                }}
-                QPushButton:pressed {{
-                    background-color: {bg}CC;
-                }}
-            """)
+            enabled = self.is_button_enabled(key)
+            if btn.isEnabled() != enabled:
+                btn.setEnabled(enabled)
 
     def is_button_enabled(self, key):
         """現在の基数でボタンが有効かどうかを判定"""
         if key.isdigit():
-            return int(key) < self.current_base
+            return int(key) < self.state.base
         elif key == "A":
-            return self.current_base > 10
+            return self.state.base > 10
         elif key == "B":
-            return self.current_base > 11
+            return self.state.base > 11
+        elif key == ".":
+            return self.state.precision > 0
         else:
             return True
 
@@ -262,95 +520,145 @@ class BaseCalculator(QWidget):
 
     def apply_language(self):
         self.btn_lang.setText(self.current_lang)
-        labels = {
-            "EN": {
-                "and": "AND", "or": "OR",   "xor": "XOR",   "clear": "C",
-                "add": "+",   "subtract": "-", "multiply": "×", "divide": "÷",
-                "0": "0",     "1": "1",      "2": "2",       "3": "3",
-                "4": "4",     "5": "5",      "6": "6",       "7": "7",
-                "8": "8",     "9": "9",      "A": "A",       "B": "B",
-                "equal": "=", "back": "⌫",
-            },
-            "JP": {
-                "and": "AND", "or": "OR",   "xor": "XOR",   "clear": "C",
-                "add": "＋",   "subtract": "－", "multiply": "×", "divide": "÷",
-                "0": "0",     "1": "1",      "2": "2",       "3": "3",
-                "4": "4",     "5": "5",      "6": "6",       "7": "7",
-                "8": "8",     "9": "9",      "A": "A",       "B": "B",
-                "equal": "＝", "back": "⌫",
-            },
-        }
+        self.precision_box.setToolTip(PRECISION_TIPS[self.current_lang])
         for k, btn in self.buttons.items():
-            btn.setText(labels[self.current_lang][k])
+            btn.setText(LABELS[self.current_lang][k])
 
     # base switching
     def set_base(self, base):
-        if self.current_base == base:
+        if self.state.base == base:
             return
-        self.current_base = base
-        self.reset_state()
+        state = self.state
+        old_base = state.base
+        self.cancel_pending()
+        # 整数の入力と結果は値を保ったまま新しい基数で表示し直す
+        state.rebase(base)
+        self.update_base_buttons(old_base)
+        held = state.operand1
+        if state.operator is not None or not held:
+            self.update_display()
+        elif not held.rendered and held.bit_length() >= ASYNC_BITS:
+            # 巨大な値の新しい基数での上位・下位の桁は別スレッドで求める
+            task = Task(_result_task, held.value, base, None,
+                        self.display_size())
+            self.start_pending(task.future, task.cancel)
+            QThreadPool.globalInstance().start(task)
+        else:
+            self.show_operand(held)
+
+    def set_precision(self, precision):
+        """小数点以下の桁数を変える。0 にしたら入力中の小数は消す"""
+        state = self.state
+        state.precision = precision
+        result = state.last_result
+        if not precision and (state.operand1.fractional or state.operand2.fractional
+                              or (result is not None and result.fractional)):
+            self.cancel_pending()
+            state.last_result = None
+            state.reset()
+        else:
+            for op in (state.operand1, state.operand2):
+                op.set_precision(precision or fixed.DEFAULT_PRECISION)
+        self.buttons["."].setEnabled(precision > 0)
         self.update_display()
-        self.apply_theme()
-        self.last_result = ""
 
-    def update_decimal_bar(self, value_str=""):
+    def update_decimal_bar(self, operand=None):
+        """10進数変換バーの更新を予約（連打されても変換は1回だけ）"""
+        self._bar_operand = operand
+        if not self._bar_pending:
+            self._bar_pending = True
+            QTimer.singleShot(0, self._refresh_decimal_bar)
+
+    @instrument.timed("gui.update_decimal_bar")
+    def _refresh_decimal_bar(self):
         """10進数変換バーを更新"""
-        if not value_str:
+        self._bar_pending = False
+        if self._bar_task is not None:
+            # 前の変換はもう表示されないので中断する
+            self._bar_task.cancel()
+            self._bar_task = None
+        operand = self._bar_operand
+        if not operand:
             self.decimal_bar.setText("")
             return
-        
-        try:
-            # 負の数に対応
-            if value_str.startswith("-"):
-                decimal_value = -int(value_str[1:], self.current_base)
-            else:
-                decimal_value = int(value_str, self.current_base)
-            
-            if self.current_base == 10:
-                # 既に10進数の場合は他の基数での表現を表示
-                base_labels = {2: "BIN", 3: "BASE3", 12: "BASE12"}
-                other_bases = [b for b in [2, 3, 12] if b != 10]
-                conversions = []
-                for base in other_bases:
-                    sign = "-" if decimal_value < 0 else ""
-                    converted = self.to_base(abs(decimal_value), base)
-                    conversions.append(f"{base_labels[base]}: {sign}{converted}")
-                
-                text = " | ".join(conversions)
-            else:
-                # 他の基数の場合は10進数を表示
-                text = f"DEC: {decimal_value}"
-            
-            self.decimal_bar.setText(text)
-            
-        except ValueError:
-            self.decimal_bar.setText("")
+
+        # 既に10進数の場合は他の基数での表現、他の基数の場合は10進数を表示する。
+        # バーに入りきる上位・下位の桁だけを求め、全桁は変換しない
+        bases = (2, 3, 12) if self.state.base == 10 else (10,)
+        head, tail = (4, 4) if len(bases) > 1 else (10, 10)
+        missing = [b for b in bases
+                   if operand.cached_preview(b, head, tail) is None]
+        if missing and operand.bit_length() >= ASYNC_BITS:
+            # 大きな数は別スレッドで求め、終わったら表示し直す
+            task = Task(_preview_task, operand.value, missing, head, tail)
+            task.operand = operand
+            task.version = operand.version
+            task.head, task.tail = head, tail
+            task.future.add_done_callback(self.render_finished.emit)
+            self._bar_task = task
+            self.decimal_bar.setText("…")
+            QThreadPool.globalInstance().start(task)
+            return
+
+        sign = "-" if operand.negative else ""
+        if self.state.base == 10:
+            base_labels = {2: "BIN", 3: "BASE3", 12: "BASE12"}
+            conversions = [
+                f"{base_labels[base]}: "
+                f"{_elide(sign, *operand.preview(base, head, tail)[:2])}"
+                for base in bases
+            ]
+            text = " | ".join(conversions)
+        else:
+            text = f"DEC: {_elide(sign, *operand.preview(10, head, tail)[:2])}"
+
+        self.decimal_bar.setText(text)
+
+    def on_render_finished(self, future):
+        task = self._bar_task
+        if task is None or task.future is not future or future.cancelled():
+            return
+        self._bar_task = None
+        for base, preview in future.result().items():
+            task.operand.store_preview(base, task.head, task.tail, preview,
+                                       task.version)
+        self._refresh_decimal_bar()
 
     def is_valid_digit(self, key):
         """現在の基数で有効な桁かどうかを判定"""
         if key.isdigit():
-            return int(key) < self.current_base
+            return int(key) < self.state.base
         elif key == "A":
-            return self.current_base > 10
+            return self.state.base > 10
         elif key == "B":
-            return self.current_base > 11
+            return self.state.base > 11
+        elif key == ".":
+            return self.state.precision > 0
         return False
 
     # input / calc
     def on_button(self, key):
+        # ボタンの clicked から partial で呼ばれるので、引数の数を変えないよう
+        # デコレータではなくここで計測する
+        instrument.count("gui.keys")
+        with instrument.timer("gui.on_button"):
+            self._on_button(key)
+
+    def _on_button(self, key):
+        # 計算中に次の入力があれば、その計算は中断して結果を捨てる
+        self.cancel_pending()
+
         # clear
         if key == "clear":
-            self.reset_state()
-            self.display.setText("0")
-            self.decimal_bar.setText("")
-            self.last_result = ""
+            self.state.reset()
+            self.set_display("0")
+            self.update_decimal_bar()
+            self.state.last_result = None
             return
 
         # backspace
         if key == "back":
-            tgt = "operand2" if self.editing_second else "operand1"
-            s = getattr(self, tgt)[:-1]
-            setattr(self, tgt, s)
+            self.state.target.pop()
             self.update_display()
             return
 
@@ -359,137 +667,415 @@ class BaseCalculator(QWidget):
             self.calculate()
             return
 
+        state = self.state
+
         # operator
-        if key in ("add", "subtract", "multiply", "divide",
-                   "and", "or", "xor"):
-            if not self.operand1:
+        if key in core.OPERATORS:
+            if not state.operand1:
                 # if previous calculation result is available, use that
-                if self.last_result:
-                    self.operand1 = self.last_result
+                if state.last_result:
+                    state.operand1 = state.recall()
                 else:
                     return
             # chaining: if result just shown, allow new operator for continued input
-            if not self.editing_second and self.operator is None and self.last_result:
-                self.operand1 = self.last_result
-            self.operator = key
-            self.editing_second = True
-            self.operand2 = ""
+            if not state.editing_second and state.operator is None and state.last_result:
+                state.operand1 = state.recall()
+            state.operator = key
+            state.editing_second = True
+            state.operand2 = state.operand()
             self.update_display()
             return
 
-        # digit (including A and B)
-        if key.isdigit() or key in ("A", "B"):
+        # digit (including A, B and the point)
+        if key.isdigit() or key in ("A", "B", "."):
             # 現在の基数で有効な桁かチェック
             if not self.is_valid_digit(key):
                 return
             
             # chaining: if previous result just shown and inputting digit,
             # start new calculation
-            if self.last_result and not self.editing_second and not self.operator and not self.operand1:
-                self.reset_state()
-                self.display.setText("0")
-                self.decimal_bar.setText("")
-            if not self.editing_second:
-                self.operand1 += key
-            else:
-                self.operand2 += key
+            if state.last_result and not state.editing_second and not state.operator and not state.operand1:
+                state.reset()
+                self.set_display("0")
+                self.update_decimal_bar()
+            state.target.push(key)
             self.update_display()
 
+    @instrument.timed("gui.update_display")
     def update_display(self):
-        if not self.operator:
-            txt = self.operand1 or "0"
+        state = self.state
+        if not state.operator:
             # 数値入力中は10進数変換を表示
-            if self.operand1:
-                self.update_decimal_bar(self.operand1)
+            self.update_decimal_bar(state.operand1)
+            if state.operand1:
+                self.display_operand(state.operand1)
             else:
-                self.decimal_bar.setText("")
+                self.set_display("0", 1)
+            return
+        # 演算子入力中は第二オペランドの10進数変換を表示
+        self.update_decimal_bar(state.operand2)
+        self.display_expression(state.operand1, state.symbol, state.operand2)
+
+    def _display_metrics(self):
+        # (フォントの寸法, 表示欄の幅から padding-right と少しの余裕を引いた幅, 入る桁数)
+        metrics = QFontMetrics(self.display.font())
+        width = self.display.contentsRect().width() - 24
+        return metrics, width, width // metrics.horizontalAdvance("0")
+
+    def display_size(self):
+        """表示欄に入りきらない数を表示するときの (上位の桁数, 下位の桁数)"""
+        fits = self._display_metrics()[2]
+        head = max((fits - 1) // 2, 1)
+        return head, max(fits - 1 - head, 1)
+
+    @instrument.timed("gui.set_display")
+    def set_display(self, text, digits=None, value=None):
+        """表示欄に入りきる上位・下位の桁と桁数だけを描画する（全文はコピー・書き出し用）
+
+        value は表示している計算結果の値（入力中の表示では None）。書き出しに使う。
+        """
+        self._display_full = text
+        self._display_value = value
+        metrics, width, fits = self._display_metrics()
+        if len(text) <= fits and metrics.horizontalAdvance(text) <= width:
+            self.display.setTextFormat(Qt.PlainText)
+            self.display.setText(text)
+            return
+        self._set_elided(text, text, digits, metrics, width, fits)
+
+    @instrument.timed("gui.display_operand")
+    def display_operand(self, operand, value=None):
+        """operand を表示する。表記がまだなければ全桁は変換せず、
+        表示欄に入る上位・下位の桁と桁数だけを求める（radix.preview）
+        """
+        if operand.rendered:
+            self.set_display(operand.text, len(operand), value)
+            return
+        metrics, width, fits = self._display_metrics()
+        top, low, count = operand.preview(operand.base, *self.display_size())
+        if not low:
+            # 全桁が表示欄に入る（preview が表記も覚えている）
+            self.set_display(operand.text, count, value)
+            return
+        self._display_full = lambda: operand.text
+        self._display_value = value
+        sign = "-" if operand.negative else ""
+        self._set_elided(sign + top, low, count, metrics, width, fits)
+
+    @instrument.timed("gui.display_expression")
+    def display_expression(self, x, symbol, y):
+        """「x 演算子 y」を表示する。入りきらなければ各オペランドの中ほどを
+        別々に省き、演算子は必ず見せる（式の全文はコピー・書き出しのときに作る）
+        """
+        if x.rendered and y.rendered:
+            self._display_full = f"{x.text} {symbol} {y.text}"
         else:
-            sym = self.op_symbol()
-            txt = f"{self.operand1} {sym} {self.operand2 or ''}"
-            # 演算子入力中は第二オペランドの10進数変換を表示
-            if self.operand2:
-                self.update_decimal_bar(self.operand2)
-            else:
-                self.decimal_bar.setText("")
-        self.display.setText(txt)
+            self._display_full = lambda: f"{x.text} {symbol} {y.text}"
+        self._display_value = None
+        metrics, width, fits = self._display_metrics()
+        size = self.display_size()
+        px, py = _operand_parts(x, size), _operand_parts(y, size)
+        sep = f" {symbol} "
+        budget = max(min(px[2] + py[2], fits), 2)
+        while True:
+            nx, ny = _split_budget(px[2], py[2], budget)
+            text = f"{_elide_parts(px, nx)}{sep}{_elide_parts(py, ny)}"
+            if budget <= 2 or metrics.horizontalAdvance(text) <= width:
+                break
+            budget -= 1
+        self.display.setTextFormat(Qt.PlainText)
+        self.display.setText(text)
+
+    def _set_elided(self, top, low, digits, metrics, width, fits):
+        # top の上位と low の下位の桁を「…」でつなぎ、表示欄に入るまで縮める
+        while True:
+            head = (fits - 1) // 2
+            tail = max(fits - 1 - head, 1)
+            elided = f"{top[:head]}…{low[-tail:]}"
+            if fits <= 3 or metrics.horizontalAdvance(elided) <= width:
+                break
+            fits -= 1
+        if digits is not None:
+            label = {
+                "EN": f"{digits:,} digits",
+                "JP": f"{digits:,} 桁"
+            }[self.current_lang]
+            elided += ("<br><span style='font-size:14pt; font-weight:normal'>"
+                       f"{label}</span>")
+        self.display.setTextFormat(Qt.RichText)
+        self.display.setText(elided)
+
+    def display_text(self):
+        """表示している文字列の全文（表記がまだない計算結果はここで変換する）"""
+        full = self._display_full
+        return full() if callable(full) else full
+
+    def copy_display(self):
+        QApplication.clipboard().setText(self.display_text())
+
+    def file_filters(self):
+        """ファイルダイアログの基数ごとのフィルタと、現在の基数のフィルタ"""
+        label = {"EN": "Base {} (*.txt)", "JP": "{}進数 (*.txt)"}[self.current_lang]
+        filters = [label.format(base) for base in radix.SUPPORTED_BASES]
+        return filters, filters[radix.SUPPORTED_BASES.index(self.state.base)]
 
-    def op_symbol(self):
-        return {
-            "add": "+", "subtract": "-", "multiply": "×",
-            "divide": "÷", "and": "AND", "or": "OR", "xor": "XOR"
-        }[self.operator]
+    def export_display(self):
+        """表示中の計算結果を、ダイアログで選んだ基数でファイルに書き出す
+
+        入力中の表示（式や小数を含む）は基数を変えずにそのまま書き出す。
+        """
+        title = {"EN": "Export", "JP": "書き出し"}[self.current_lang]
+        filters, current = self.file_filters()
+        path, selected = QFileDialog.getSaveFileName(
+            self, title, "result.txt", ";;".join(filters), current)
+        if not path:
+            return
+        base = radix.SUPPORTED_BASES[filters.index(selected or current)]
+        try:
+            if self._display_value is not None:
+                # 巨大な結果でも上位桁から少しずつ変換して書き出す
+                fileio.write_number(path, self._display_value, base)
+                return
+            text = self.display_text()
+            with open(path, "w", encoding="ascii", newline="\n",
+                      buffering=fileio.BUFFER_SIZE) as f:
+                step = radix.CHUNK_DIGITS
+                for i in range(0, len(text), step):
+                    f.write(text[i:i + step])
+                f.write("\n")
+        except OSError as e:
+            self.show_calc_error(e)
+
+    def import_file(self):
+        """ファイルの数（ダイアログで選んだ基数）を読み込み、結果として表示する"""
+        title = {"EN": "Import", "JP": "読み込み"}[self.current_lang]
+        filters, current = self.file_filters()
+        path, selected = QFileDialog.getOpenFileName(
+            self, title, "", ";;".join(filters), current)
+        if not path:
+            return
+        self.cancel_pending()
+        file_base = radix.SUPPORTED_BASES[filters.index(selected or current)]
+        # 巨大なファイルでも固まらないよう、読み込みと変換は別スレッドで行う
+        task = Task(_import_task, path, file_base, self.state.base,
+                    self.display_size())
+        self.start_pending(task.future, task.cancel)
+        QThreadPool.globalInstance().start(task)
+
+    def show_display_menu(self, pos):
+        labels = {
+            "EN": ("Copy", "Paste expression", "Import…", "Export…"),
+            "JP": ("コピー", "式を貼り付け", "読み込み…", "書き出し…"),
+        }[self.current_lang]
+        menu = QMenu(self)
+        menu.addAction(labels[0], self.copy_display)
+        menu.addAction(labels[1], self.paste_expression)
+        menu.addAction(labels[2], self.import_file)
+        menu.addAction(labels[3], self.export_display)
+        menu.exec_(self.display.mapToGlobal(pos))
+
+    def paste_expression(self):
+        """クリップボードの式（例: (1011 XOR 110) * 21）を現在の基数で計算する"""
+        self.cancel_pending()
+        state = self.state
+        try:
+            e = expr.compile(QApplication.clipboard().text(), state.base,
+                             exact=state.precision > 0)
+            r = e.evaluate()
+        except (ZeroDivisionError, ValueError) as err:
+            self.show_calc_error(err)
+            return
+        state.reset()
+        # 整数の結果は表示する桁だけを変換する（小数は精度の桁までなので小さい）
+        self.show_result(r, e.format(r, state.precision) if e.exact else None)
 
     def to_base(self, num: int, base: int) -> str:
         """Convert non-negative integer to string in given base."""
-        if num == 0:
-            return "0"
-        digits = []
-        while num > 0:
-            d = num % base
-            if d < 10:
-                digits.append(str(d))
-            else:
-                # for base > 10, use A, B...
-                digits.append(chr(ord("A") + d - 10))
-            num //= base
-        return "".join(reversed(digits))
+        return radix.to_base(num, base)
 
+    @instrument.timed("gui.calculate")
     def calculate(self):
-        if not (self.operand1 and self.operator and self.operand2):
+        state = self.state
+        if not state.ready:
+            return
+        if instrument.enabled():
+            instrument.observe("operand_digits", len(state.operand1))
+            instrument.observe("operand_digits", len(state.operand2))
+        x = state.operand1.value
+        y = state.operand2.value
+
+        if state.fractional:
+            self.calculate_fixed(x, y)
+            return
+        # 基数のべきとの掛け算・割り算などは、結果の表記を桁の操作で求める
+        text = self.shifted_text()
+        if text is None and parallel.is_large(x, y):
+            # 巨大な数はプロセスプールで計算する（始まった計算は止められない）
+            future = parallel.submit_calculation(state.operator, x, y, state.base)
+            self.start_pending(future, future.cancel)
+            return
+        if max(abs(x).bit_length(), abs(y).bit_length()) >= ASYNC_BITS:
+            task = Task(_calculate_task, state.operator, x, y, state.base, text,
+                        self.display_size())
+            self.start_pending(task.future, task.cancel)
+            QThreadPool.globalInstance().start(task)
             return
+
         try:
-            x = int(self.operand1, self.current_base)
-            y = int(self.operand2, self.current_base)
-
-            if self.operator == "add":
-                r = x + y
-            elif self.operator == "subtract":
-                r = x - y
-            elif self.operator == "multiply":
-                r = x * y
-            elif self.operator == "divide":
-                if y == 0:
-                    raise ZeroDivisionError
-                r = x // y
-            elif self.operator == "and":
-                r = x & y
-            elif self.operator == "or":
-                r = x | y
-            elif self.operator == "xor":
-                r = x ^ y
-
-            sign = "-" if r < 0 else ""
-            res = self.to_base(abs(r), self.current_base)
-            result_str = sign + res
-            self.display.setText(result_str)
-            
-            # 計算結果の10進数変換を表示
-            self.update_decimal_bar(result_str)
-            
-            self.last_result = result_str
-            self.reset_state(keep_result=True)
+            r = core.apply(state.operator, x, y, state.base)
+        except (ZeroDivisionError, ValueError) as e:
+            self.show_calc_error(e)
+            return
+        # 結果の全桁は変換せず、表示欄に入る桁だけを求める
+        self.show_result(r, text)
+
+    def shifted_text(self):
+        """結果の表記を shift で求められればそれを、できなければ None を返す"""
+        state = self.state
+        x, y = state.operand1, state.operand2
+        if not (x.rendered and y.rendered):
+            # 表記がまだない値（変換待ちの結果など）を変換してまで使うことはしない
+            return None
+        return shift.calculate(state.operator, x.text, y.text, state.base)
+
+    def calculate_fixed(self, x, y):
+        """割り算を切り捨てず、小数点以下 precision 桁まで求める"""
+        state = self.state
+        bits = max(state.operand1.bit_length(), state.operand2.bit_length(),
+                   state.precision)
+        if bits >= ASYNC_BITS:
+            task = Task(_fixed_task, state.operator, x, y, state.base,
+                        state.precision)
+            self.start_pending(task.future, task.cancel)
+            QThreadPool.globalInstance().start(task)
+            return
+        try:
+            r = fixed.apply(state.operator, x, y, state.base)
+        except (ZeroDivisionError, ValueError) as e:
+            self.show_calc_error(e)
+            return
+        self.show_result(r, fixed.format_value(r, state.base, state.precision))
+
+    def start_pending(self, future, cancel):
+        """計算中の表示にして、終わったら job_finished で結果を受け取る"""
+        self._pending = future
+        self._cancel_pending = cancel
+        self.set_busy(True)
+        future.add_done_callback(self.job_finished.emit)
+
+    def cancel_pending(self):
+        """計算中の仕事を中断し、あとで届く結果は捨てる"""
+        if self._pending is None:
+            return
+        self._cancel_pending()
+        self._pending = None
+        self._cancel_pending = None
+        self.set_busy(False)
+        self.update_display()
+
+    def set_busy(self, busy):
+        if busy:
+            self.setCursor(Qt.BusyCursor)
+            self.decimal_bar.setText({
+                "EN": "Calculating… (Esc to cancel)",
+                "JP": "計算中…（Esc で中断）"
+            }[self.current_lang])
+        else:
+            self.unsetCursor()
 
-        except ZeroDivisionError:
+    def on_job_finished(self, future):
+        # 中断された計算や、新しい入力で置き換えられた計算の結果は捨てる
+        if future is not self._pending or future.cancelled():
+            return
+        self._pending = None
+        self._cancel_pending = None
+        self.set_busy(False)
+        try:
+            result = future.result()
+        except Exception as e:
+            # 想定外の例外もスロットの外へ出すとアプリが落ちるので、ここで表示する
+            self.show_calc_error(e)
+            return
+        if isinstance(result, Operand):
+            # QThreadPool の仕事は、表示する桁を求めた Operand を返す
+            self.show_operand(result)
+            return
+        # プロセスプールと小数の計算は (値, 表記) を返す
+        r, result_str = result
+        if isinstance(r, int):
+            # 続けて計算するときに結果の文字列を解析し直さなくて済むよう覚えておく
+            conversions.store(r, self.state.base, result_str)
+        self.show_result(r, result_str)
+
+    def show_result(self, r, result_str=None):
+        """計算結果を表示する（整数の表記 result_str がなければ表示する桁だけ変換する）"""
+        # 整数の結果は int のまま覚え、続けて計算するときに解析し直さない
+        self.state.store_result(r, result_str)
+        self._show_last_result()
+
+    def show_operand(self, operand):
+        """計算結果の Operand を覚えて表示する"""
+        self.state.store_operand(operand)
+        self._show_last_result()
+
+    def _show_last_result(self):
+        result = self.state.last_result
+        # 書き出し用の値は整数のときだけ（小数は表示した桁までを書き出す）
+        self.display_operand(result, None if result.point else result.value)
+
+        # 計算結果の10進数変換を表示
+        self.update_decimal_bar(self.state.operand1)
+
+    def show_calc_error(self, error):
+        if isinstance(error, ZeroDivisionError):
             msg = {
                 "EN": "Cannot divide by zero.",
                 "JP": "ゼロで割ることはできません。"
             }[self.current_lang]
-            QMessageBox.critical(self, "Error", msg, QMessageBox.Close)
-            self.last_result = ""
-            self.reset_state()
-            self.decimal_bar.setText("")
-
-        except ValueError:
+        elif isinstance(error, (fileio.NumberFileError, OSError)):
+            msg = {
+                "EN": "Cannot read or write the file.",
+                "JP": "ファイルを読み書きできません。"
+            }[self.current_lang] + f"\n{error}"
+        elif isinstance(error, ValueError):
             msg = {
                 "EN": "Invalid input.",
                 "JP": "無効な入力です。"
             }[self.current_lang]
-            QMessageBox.critical(self, "Error", msg, QMessageBox.Close)
-            self.last_result = ""
-            self.reset_state()
-            self.decimal_bar.setText("")
+        else:
+            msg = {
+                "EN": "Unexpected error.",
+                "JP": "予期しないエラーです。"
+            }[self.current_lang] + f"\n{type(error).__name__}: {error}"
+        QMessageBox.critical(self, "Error", msg, QMessageBox.Close)
+        self.state.last_result = None
+        self.state.reset()
+        self.update_decimal_bar()
+
+    def show_debug_panel(self):
+        """計測のデバッグ画面（メニューには出さない）"""
+        if self._debug_panel is None:
+            self._debug_panel = DebugPanel(self)
+        self._debug_panel.show()
+        self._debug_panel.raise_()
 
     def keyPressEvent(self, event):
+        if (event.key() == Qt.Key_D and event.modifiers()
+                == Qt.ControlModifier | Qt.ShiftModifier):
+            self.show_debug_panel()
+            return
+        if event.matches(QKeySequence.Copy):
+            self.copy_display()
+            return
+        if event.matches(QKeySequence.Paste):
+            self.paste_expression()
+            return
+        if event.matches(QKeySequence.Open):
+            self.import_file()
+            return
+        if event.matches(QKeySequence.Save):
+            self.export_display()
+            return
         # Optional: allow keyboard input for quick testing
         keymap = {
             Qt.Key_0: "0", Qt.Key_1: "1", Qt.Key_2: "2", Qt.Key_3: "3",
@@ -499,6 +1085,7 @@ class BaseCalculator(QWidget):
             Qt.Key_Asterisk: "multiply", Qt.Key_Slash: "divide",
             Qt.Key_Equal: "equal", Qt.Key_Return: "equal", Qt.Key_Enter: "equal",
             Qt.Key_Backspace: "back", Qt.Key_Delete: "clear",
+            Qt.Key_Escape: "clear", Qt.Key_Period: ".",
         }
         if event.key() in keymap:
             self.on_button(keymap[event.key()])
@@ -0,0 +1,6 @@
+"""2,3,10,12進数電卓の共通エンジン（GUI 非依存）"""
+
+from .parse import parse_int
+from .radix import DIGITS, SUPPORTED_BASES, format_int, to_base
+
+__all__ = ["DIGITS", "SUPPORTED_BASES", "format_int", "parse_int", "to_base"]
@@ -0,0 +1,186 @@
+"""多倍長整数のバックエンド
+
+計算コア（core の掛け算・割り算）、基数変換（cache.conversions、expr、fixed）、
+一括計算 CLI は、多倍長整数の演算と文字列 ⇔ 整数の変換をここを通して行う。
+
+- "python": CPython の int と、radix / parse の分割統治（いつでも使える）
+- "gmpy2":  gmpy2 の mpz（GMP）。mpz(s, base) と mpz.digits(base) で変換する
+
+既定では gmpy2 がインストールされていればそれを、なければ python を使う。
+環境変数 BASECALC_BACKEND（使えない名前なら無視する）か use() で選べる。どのバックエンドも
+受け取る値・返す値は Python の int と str で、結果とエラーは python と同じになる。
+multiply / floor_divide は fixed から Fraction も渡されるので、int 以外はそのまま
+Python の演算子で計算する。
+すべてのバックエンドが同じ結果を返すかは basecalc.conformance で確かめられる。
+"""
+import os
+
+from . import instrument, parse, radix
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+# バックエンドを選ぶ環境変数（子プロセスにも引き継がれる）
+ENV_VAR = "BASECALC_BACKEND"
+
+
+class PythonBackend:
+    """CPython の int と radix / parse の変換"""
+
+    name = "python"
+    # 変換を C で行うか（parallel が分割して並列に変換する意味があるか）
+    native = False
+
+    def parse_int(self, s, base):
+        return parse.parse_int(s, base)
+
+    def to_base(self, num, base):
+        return radix.to_base(num, base)
+
+    def format_int(self, num, base):
+        return radix.format_int(num, base)
+
+    def iter_format(self, num, base, size=radix.CHUNK_DIGITS):
+        return radix.iter_format(num, base, size)
+
+    def multiply(self, x, y):
+        return x * y
+
+    def floor_divide(self, x, y):
+        if type(x) is not int or type(y) is not int or (
+                y.bit_length() <= radix._DIV_LIMIT):
+            return x // y
+        # 大きな割る数は Burnikel-Ziegler 法で（-∞ 方向への切り捨てに直す）
+        q, r = radix.fast_divmod(abs(x), abs(y))
+        if (x < 0) != (y < 0):
+            return -q - 1 if r else -q
+        return q
+
+
+class GmpyBackend(PythonBackend):
+    """gmpy2 の mpz。小さな数は int ⇔ mpz の変換の方が高くつくので int のまま"""
+
+    name = "gmpy2"
+    native = True
+    # これ以上のビット数（文字列なら桁数）の数を mpz で扱う
+    MIN_BITS = 1 << 10
+    MIN_DIGITS = 300
+
+    def parse_int(self, s, base):
+        if len(s) < self.MIN_DIGITS or base == 2:
+            return parse.parse_int(s, base)
+        sign, digits = parse.split_digits(s, base)
+        return sign * int(gmpy2.mpz(digits, base))
+
+    def to_base(self, num, base):
+        if base == 2 or num.bit_length() < self.MIN_BITS:
+            return radix.to_base(num, base)
+        radix._check(num, base)
+        text = gmpy2.mpz(num).digits(base)
+        return text.upper() if base == 12 else text
+
+    def format_int(self, num, base):
+        sign = "-" if num < 0 else ""
+        return sign + self.to_base(abs(num), base)
+
+    def iter_format(self, num, base, size=radix.CHUNK_DIGITS):
+        if base == 2 or num.bit_length() < self.MIN_BITS:
+            return radix.iter_format(num, base, size)
+        if size < 1:
+            raise ValueError("size must be positive")
+        # GMP は全桁を一度に変換するので、できた文字列を size 文字ずつ切る
+        text = self.format_int(num, base)
+        return (text[i:i + size] for i in range(0, len(text), size))
+
+    def multiply(self, x, y):
+        if (type(x) is not int or type(y) is not int
+                or x.bit_length() < self.MIN_BITS
+                or y.bit_length() < self.MIN_BITS):
+            return x * y
+        return int(gmpy2.mpz(x) * gmpy2.mpz(y))
+
+    def floor_divide(self, x, y):
+        # 割る数が小さければ CPython の割り算も線形時間で済む
+        if (type(x) is not int or type(y) is not int
+                or y.bit_length() < self.MIN_BITS):
+            return x // y
+        return int(gmpy2.mpz(x) // gmpy2.mpz(y))
+
+
+BACKENDS = {"python": PythonBackend, "gmpy2": GmpyBackend}
+
+
+def available():
+    """使えるバックエンドの名前（既定で選ばれる順）"""
+    names = ["python"]
+    if gmpy2 is not None:
+        names.insert(0, "gmpy2")
+    return names
+
+
+def _create(name):
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend: {name!r} "
+                         f"(choose from {', '.join(BACKENDS)})")
+    if name not in available():
+        raise ValueError(f"backend {name!r} is not installed")
+    return BACKENDS[name]()
+
+
+def _default():
+    # 環境変数のバックエンドがこの環境で使えなければ、既定の選び方に戻る
+    name = os.environ.get(ENV_VAR)
+    return _create(name if name in available() else available()[0])
+
+
+_active = _default()
+
+
+def get():
+    """使用中のバックエンド"""
+    return _active
+
+
+def use(name=None):
+    """バックエンドを name に切り替える（None なら既定の選び方に戻す）
+
+    parallel のプロセスも同じバックエンドを使うよう、環境変数にも設定する。
+    """
+    global _active
+    if name is None:
+        os.environ.pop(ENV_VAR, None)
+        _active = _create(available()[0])
+    else:
+        _active = _create(name)
+        os.environ[ENV_VAR] = name
+    return _active
+
+
+@instrument.timed("parse")
+def parse_int(s, base):
+    """parse.parse_int と同じ（先頭の +/- 可、不正な文字は InvalidDigitError）"""
+    return _active.parse_int(s, base)
+
+
+@instrument.timed("format")
+def to_base(num, base):
+    return _active.to_base(num, base)
+
+
+@instrument.timed("format")
+def format_int(num, base):
+    return _active.format_int(num, base)
+
+
+def iter_format(num, base, size=radix.CHUNK_DIGITS):
+    return _active.iter_format(num, base, size)
+
+
+def multiply(x, y):
+    return _active.multiply(x, y)
+
+
+def floor_divide(x, y):
+    return _active.floor_divide(x, y)
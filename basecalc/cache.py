@@ -0,0 +1,131 @@
+"""変換結果の LRU キャッシュ
+
+基数の切り替えや計算結果の連鎖では、同じ値を何度も文字列 ⇔ int 変換する。
+ここでは (文字列, 基数) → 値 と (値, 基数) → 文字列 の両方向を覚えておき、
+合計の大きさが上限を超えたら古いものから捨てる。大きさは値と表記の組ごとに
+1回だけ、表記の桁数（バイト数）と int のバイト数の和で数える（両方向のキーが
+同じ組を指していても二重には数えない）。
+"""
+import threading
+from collections import OrderedDict
+
+from .backend import format_int, parse_int
+
+# 既定の上限（表記の桁数と int のバイト数の合計）
+DEFAULT_MAX_DIGITS = 64 << 20
+
+# これより短い数は変換の方が安いので覚えない
+MIN_DIGITS = 64
+
+
+class _Entry:
+    # 値と表記の組。refs はこの組を指しているキーの数
+    __slots__ = ("value", "text", "cost", "refs")
+
+    def __init__(self, value, text, cost):
+        self.value = value
+        self.text = text
+        self.cost = cost
+        self.refs = 0
+
+
+class ConversionCache:
+    """parse_int / format_int の結果を大きさの合計で制限して保持する"""
+
+    def __init__(self, max_digits=DEFAULT_MAX_DIGITS, min_digits=MIN_DIGITS):
+        self.max_digits = max_digits
+        self.min_digits = min_digits
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = OrderedDict()   # key -> _Entry
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _release(self, key):
+        # key を外し、どのキーからも指されなくなった組の分だけ size を減らす
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.refs -= 1
+            if not entry.refs:
+                self.size -= entry.cost
+
+    def _put(self, keys, value, text):
+        # keys のすべてから1つの組を指す（大きさは1回だけ数える）
+        cost = len(text) + value.bit_length() // 8
+        if len(text) < self.min_digits or cost > self.max_digits:
+            return
+        entry = _Entry(value, text, cost)
+        with self._lock:
+            for key in keys:
+                self._release(key)
+                self._entries[key] = entry
+                entry.refs += 1
+            self.size += cost
+            while self.size > self.max_digits:
+                self._release(next(iter(self._entries)))
+
+    def store(self, value, base, text):
+        """値と表記の組を両方向で登録する（text は format_int と同じ正規形）"""
+        self._put((("p", base, text), ("f", base, value)), value, text)
+
+    def parse_int(self, text, base):
+        """parse_int(text, base) のキャッシュ付き版"""
+        if len(text) < self.min_digits:
+            return parse_int(text, base)
+        entry = self._get(("p", base, text))
+        if entry is not None:
+            return entry.value
+        value = parse_int(text, base)
+        keys = [("p", base, text)]
+        if text == text.upper() and not text.lstrip("-").startswith(("0", "+")):
+            # 正規形の表記なら、値から表記を引くときにも使える
+            keys.append(("f", base, value))
+        self._put(keys, value, text)
+        return value
+
+    def lookup(self, value, base):
+        """format_int(value, base) が覚えてあればその文字列、なければ None"""
+        if value.bit_length() < self.min_digits:
+            return None
+        entry = self._get(("f", base, value))
+        return entry.text if entry is not None else None
+
+    def format_int(self, value, base):
+        """format_int(value, base) のキャッシュ付き版"""
+        # 桁数の概算（2進数の桁数で見る）で小さな値は素通しにする
+        if value.bit_length() < self.min_digits:
+            return format_int(value, base)
+        entry = self._get(("f", base, value))
+        if entry is not None:
+            return entry.text
+        text = format_int(value, base)
+        self.store(value, base, text)
+        return text
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "digits": self.size,
+            "max_digits": self.max_digits,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# アプリ全体で共有するキャッシュ
+conversions = ConversionCache()
@@ -0,0 +1,232 @@
+"""一括計算 CLI
+
+1行に1つ「オペランド 演算子 オペランド」または "(1011 xor 110) * 21" のような
+式（basecalc.expr）を書いた入力（ファイルまたは標準入力）を読み、結果を1行ずつ出力する。入力は1行ずつ読み、出力はまとめて書き出すので、
+何百万行でもメモリ使用量は一定のまま処理できる。巨大な結果は文字列全体を作らず、
+上位桁から少しずつ変換しながら書き出す。基数のべきとの掛け算・割り算などは
+変換せずに桁の操作で求める（basecalc.shift）。
+
+    python -m basecalc -b 3 exprs.txt > results.txt
+    echo "1011 xor 110" | python -m basecalc -b 2
+    echo "1 / 10" | python -m basecalc -b 3 -p 20      # 3進数で小数点以下 20 桁
+    python -m basecalc -j 8 huge.txt -o results.txt   # 8 プロセスで並列に計算
+    python -m basecalc -b 3 --convert 10 big.txt -o big_dec.txt
+
+--convert では各ファイルを1つの数として mmap で読み（basecalc.fileio）、別の基数で書き出す。
+"""
+import argparse
+import io
+import itertools
+import sys
+
+from . import backend, core, expr, fileio, fixed, instrument, shift
+from .backend import format_int, iter_format
+from .radix import SUPPORTED_BASES
+
+# まとめて書き出す行数
+FLUSH_LINES = 4096
+
+# これ以上のビット数の結果はチャンクに分けて書き出す
+STREAM_BITS = 1 << 20
+
+
+def iter_lines(paths):
+    """ファイル（"-" は標準入力）を順に1行ずつ yield する"""
+    for path in paths:
+        if path == "-":
+            yield from sys.stdin
+            continue
+        with open(path, encoding="utf-8") as f:
+            yield from f
+
+
+@instrument.timed("cli.line")
+def evaluate_line(line, base, precision=0):
+    """1行を計算して結果の文字列を返す。空行・コメント行は None
+
+    precision が 1 以上なら小数点付きの入力を受け付け、割り算は切り捨てずに
+    小数点以下 precision 桁まで求める。
+    結果が STREAM_BITS ビット以上の整数なら、文字列の代わりに上位桁から順に
+    部分文字列を yield するイテレータを返す。
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    parts = line.split()
+    if (len(parts) == 3 and core.is_operator(parts[1])
+            and "#" not in line and "(" not in line):
+        # 単純な「a op b」の形は式の解析をせずに計算する
+        a, op, b = parts
+        instrument.observe("operand_digits", len(a))
+        instrument.observe("operand_digits", len(b))
+        if precision > 0:
+            return fixed.calculate(a, op, b, base, precision)
+        text = shift.calculate(core.resolve_op(op), a, b, base)
+        if text is not None:
+            return text
+        value = core.evaluate(a, op, b, base)
+    else:
+        value = expr.compile(line, base, exact=precision > 0).evaluate()
+        if precision > 0:
+            return fixed.format_value(value, base, precision)
+    if value.bit_length() >= STREAM_BITS:
+        return iter_format(value, base)
+    return format_int(value, base)
+
+
+def evaluate_lines(lines, base, keep_going=True, start=1, precision=0):
+    """行のイテレータを受け取り、結果行を yield するジェネレータ"""
+    for lineno, line in enumerate(lines, start):
+        try:
+            result = evaluate_line(line, base, precision)
+        except (ValueError, ZeroDivisionError) as e:
+            if not keep_going:
+                raise ValueError(f"line {lineno}: {e}") from e
+            result = f"ERROR: {e}"
+        if result is not None:
+            yield result
+
+
+def _evaluate_batch(batch, base, keep_going, precision):
+    # プロセスプールで実行される（batch は (先頭の行番号, 行のリスト)）
+    # 結果は親プロセスへ送るので、チャンクのイテレータも文字列にする。
+    # keep_going でなければ、エラーの行までの結果とエラーの文を返す
+    start, lines = batch
+    results = []
+    try:
+        for r in evaluate_lines(lines, base, keep_going, start, precision):
+            results.append(r if isinstance(r, str) else "".join(r))
+    except ValueError as e:
+        return results, str(e)
+    return results, None
+
+
+def _iter_batches(lines, size):
+    it = iter(lines)
+    start = 1
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield start, batch
+        start += len(batch)
+
+
+def _evaluate_parallel(lines, base, keep_going, jobs, precision=0):
+    from . import parallel
+
+    parallel.get_pool(jobs)
+    for results, error in parallel.imap_batches(
+            _evaluate_batch, _iter_batches(lines, FLUSH_LINES),
+            base, keep_going, precision, window=2 * jobs):
+        yield from results
+        if error is not None:
+            raise ValueError(error)
+
+
+def run(lines, out, base, keep_going=True, jobs=1, precision=0):
+    """結果を FLUSH_LINES 行ずつまとめて out に書き出し、処理した行数を返す
+
+    jobs が 2 以上なら FLUSH_LINES 行ごとのまとまりをプロセスプールで並列に計算する。
+    """
+    if jobs > 1:
+        results = _evaluate_parallel(lines, base, keep_going, jobs, precision)
+    else:
+        results = evaluate_lines(lines, base, keep_going, precision=precision)
+    buf = []
+    count = 0
+
+    def flush():
+        nonlocal count
+        if buf:
+            out.write("\n".join(buf))
+            out.write("\n")
+            count += len(buf)
+            buf.clear()
+
+    try:
+        for result in results:
+            if isinstance(result, str):
+                buf.append(result)
+                if len(buf) >= FLUSH_LINES:
+                    flush()
+                continue
+            # 巨大な結果は、それまでの行を書き出してからチャンクごとに書く
+            flush()
+            out.writelines(result)
+            out.write("\n")
+            count += 1
+    finally:
+        # keep_going でないときのエラーで止まっても、それまでの結果は書き出す
+        flush()
+    return count
+
+
+def convert(paths, out, base, to_base):
+    """各ファイルを base 進数の1つの数として読み、to_base 進数で1行ずつ書き出す"""
+    for path in paths:
+        fileio.write_digits(out, fileio.read_number(path, base), to_base)
+        out.write("\n")
+    return len(paths)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="basecalc",
+        description="Evaluate 'a op b' lines in base 2, 3, 10 or 12.",
+    )
+    parser.add_argument("files", nargs="*", default=["-"],
+                        help="input files ('-' for stdin)")
+    parser.add_argument("-b", "--base", type=int, default=10,
+                        choices=SUPPORTED_BASES)
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file ('-' for stdout)")
+    parser.add_argument("--strict", action="store_true",
+                        help="stop at the first invalid line")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes (0 = all cores)")
+    parser.add_argument("-p", "--precision", type=int, default=0,
+                        help="fractional digits; accept 'a.b' operands and "
+                             "divide exactly (default: integer mode)")
+    parser.add_argument("--convert", type=int, metavar="BASE",
+                        choices=SUPPORTED_BASES,
+                        help="read each file as one number and write it in BASE")
+    parser.add_argument("--backend", choices=list(backend.BACKENDS),
+                        help="big-integer backend (default: gmpy2 if installed)")
+    args = parser.parse_args(argv)
+    if args.convert is not None and "-" in args.files:
+        parser.error("--convert needs input files (stdin cannot be mapped)")
+    if args.jobs == 0:
+        from . import parallel
+        args.jobs = parallel.workers()
+    if args.backend is not None:
+        try:
+            backend.use(args.backend)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.output == "-":
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8",
+                               newline="\n", write_through=False)
+    else:
+        out = open(args.output, "w", encoding="utf-8", newline="\n",
+                   buffering=1 << 20)
+    try:
+        if args.convert is not None:
+            convert(args.files, out, args.base, args.convert)
+        else:
+            run(iter_lines(args.files), out, args.base,
+                keep_going=not args.strict, jobs=args.jobs,
+                precision=args.precision)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"basecalc: {e}\n")
+    finally:
+        if args.output == "-":
+            out.detach()
+        else:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""多倍長整数のバックエンドの適合性チェック
+
+basecalc.backend のどのバックエンドも python と同じ結果・エラーを返すかを、
+基数変換（正規形・往復・不正な文字の位置）と符号付きの掛け算・割り算
+（Fraction を含む）について調べる。インストールされているバックエンドすべてで:
+
+    python -m basecalc.conformance
+    python -m basecalc.conformance --backend gmpy2 --seed 1
+"""
+import argparse
+import random
+import sys
+from fractions import Fraction
+
+from . import backend, parse, radix
+
+
+def _random_int(rng, bits):
+    return rng.getrandbits(bits) | (1 << (bits - 1)) if bits else 0
+
+
+def conformance(impl, seed=0, sizes=(0, 1, 63, 64, 1000, 1100, 5000, 40000)):
+    """impl（バックエンド）が python と同じ結果・エラーを返すかを調べ、食い違いの一覧を返す
+
+    変換は int() と、演算は int の演算子と比べる（python 自身も確かめられる）。
+    """
+    rng = random.Random(seed)
+    failures = []
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+
+    def expect(label, got, want):
+        if type(got) is not type(want) or got != want:
+            failures.append(f"{label}: got {got!r:.60}, want {want!r:.60}")
+
+    def expect_error(label, exc, func, *args):
+        try:
+            func(*args)
+        except exc as e:
+            return e
+        except Exception as e:
+            failures.append(f"{label}: raised {e!r}, want {exc.__name__}")
+        else:
+            failures.append(f"{label}: no error, want {exc.__name__}")
+        return None
+
+    def expect_call(label, func, args, want):
+        try:
+            got = func(*args)
+        except Exception as e:
+            failures.append(f"{label}: raised {e!r}")
+        else:
+            expect(label, got, want)
+
+    try:
+        for base in radix.SUPPORTED_BASES:
+            for bits in sizes:
+                for num in (_random_int(rng, bits), -_random_int(rng, bits)):
+                    text = impl.format_int(num, base)
+                    label = f"base {base}, {bits} bits"
+                    # 正規形: 先頭の 0 なし、大文字、int() で読むと元の値
+                    digits = text.lstrip("-")
+                    expect(f"format_int canonical ({label})",
+                           digits == "0" or not digits.startswith("0"), True)
+                    expect(f"format_int uppercase ({label})",
+                           digits == digits.upper(), True)
+                    expect(f"format_int ({label})", int(text, base), num)
+                    expect(f"to_base ({label})",
+                           impl.to_base(abs(num), base), digits)
+                    chunks = list(impl.iter_format(num, base, 1000))
+                    expect(f"iter_format ({label})", "".join(chunks), text)
+                    expect(f"iter_format sizes ({label})",
+                           all(len(c) == 1000 for c in chunks[:-1]), True)
+                    expect(f"parse_int ({label})",
+                           impl.parse_int(text, base), num)
+                    expect(f"parse_int lowercase/zeros ({label})",
+                           impl.parse_int("+00" + digits.lower(), base),
+                           abs(num))
+                    # 不正な文字の位置は python と同じ
+                    bad = text + "Z" + "1" * 400
+                    e = expect_error(f"parse_int invalid ({label})",
+                                     ValueError, impl.parse_int, bad, base)
+                    if e is not None:
+                        try:
+                            parse.parse_int(bad, base)
+                        except ValueError as want:
+                            expect(f"parse_int message ({label})",
+                                   str(e), str(want))
+            for bad in ("", "-", "+"):
+                expect_error(f"parse_int {bad!r} (base {base})", ValueError,
+                             impl.parse_int, bad, base)
+            expect_error(f"to_base negative (base {base})", ValueError,
+                         impl.to_base, -_random_int(rng, 5000), base)
+        expect_error("unsupported base", ValueError, impl.parse_int, "1", 7)
+        expect_error("unsupported base", ValueError, impl.format_int, 1, 7)
+        for xbits in sizes:
+            for ybits in sizes:
+                for sx, sy in ((1, 1), (-1, 1), (1, -1), (-1, -1)):
+                    x = sx * _random_int(rng, xbits)
+                    y = sy * _random_int(rng, ybits)
+                    label = f"{xbits}x{ybits} bits"
+                    expect(f"multiply ({label})", impl.multiply(x, y), x * y)
+                    if y:
+                        expect(f"floor_divide ({label})",
+                               impl.floor_divide(x, y), x // y)
+                        big = x * y + sx * _random_int(rng, max(ybits - 1, 0))
+                        expect(f"floor_divide 2n/n ({label})",
+                               impl.floor_divide(big, y), big // y)
+                    else:
+                        expect_error(f"floor_divide by zero ({label})",
+                                     ZeroDivisionError, impl.floor_divide,
+                                     x, y)
+                    # fixed からは Fraction（と int の組み合わせ）も渡される
+                    fx = Fraction(x, _random_int(rng, 7) or 1)
+                    fy = Fraction(y, _random_int(rng, 7) or 1)
+                    for a, b in ((fx, fy), (fx, y), (x, fy)):
+                        expect_call(f"multiply Fraction ({label})",
+                                    impl.multiply, (a, b), a * b)
+                        if b:
+                            expect_call(f"floor_divide Fraction ({label})",
+                                        impl.floor_divide, (a, b), a // b)
+    finally:
+        sys.set_int_max_str_digits(limit)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m basecalc.conformance",
+        description="Check that big-integer backends agree with pure Python.",
+    )
+    parser.add_argument("--backend", action="append",
+                        choices=list(backend.BACKENDS),
+                        help="backend to check (default: all installed)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    status = 0
+    for name in args.backend or list(backend.BACKENDS):
+        if name not in backend.available():
+            print(f"{name}: not installed")
+            continue
+        failures = conformance(backend._create(name), args.seed)
+        mark = " (active)" if name == backend.get().name else ""
+        if failures:
+            status = 1
+            print(f"{name}{mark}: {len(failures)} failure(s)")
+            for failure in failures[:20]:
+                print("  " + failure)
+        else:
+            print(f"{name}{mark}: ok")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
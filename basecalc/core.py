@@ -0,0 +1,107 @@
+"""GUI に依存しない計算コア
+
+両アプリの calculate と同じ7つの演算（add, subtract, multiply, divide,
+and, or, xor）を 2/3/10/12 進数で行う。divide は両アプリと同じく切り捨て除算。
+基数を渡すと and / or / xor はその基数の桁ごとに行う（digitwise を参照）。
+掛け算・割り算と文字列 ⇔ int の変換は backend（gmpy2 があれば GMP）で行う。
+文字列で計算するときは、基数のべきとの掛け算・割り算や桁のマスクとの論理演算を
+int に変換せず桁の操作で求める（shift を参照）。
+"""
+import operator
+from collections import namedtuple
+
+from . import backend, digitwise, instrument, shift
+from .radix import SUPPORTED_BASES
+
+
+def _divide(x, y):
+    if y == 0:
+        raise ZeroDivisionError("Division by zero.")
+    return backend.floor_divide(x, y)
+
+
+# 演算子の表の1項目: 名前（ID）、関数、式の表示に使う記号、言語ごとのボタン表示
+Operator = namedtuple("Operator", "name func symbol labels")
+
+OPERATORS = {op.name: op for op in (
+    Operator("add", operator.add, "+", {"EN": "+", "JP": "＋"}),
+    Operator("subtract", operator.sub, "-", {"EN": "-", "JP": "－"}),
+    Operator("multiply", backend.multiply, "×", {"EN": "×", "JP": "×"}),
+    Operator("divide", _divide, "÷", {"EN": "÷", "JP": "÷"}),
+    Operator("and", operator.and_, "AND", {"EN": "AND", "JP": "AND"}),
+    Operator("or", operator.or_, "OR", {"EN": "OR", "JP": "OR"}),
+    Operator("xor", operator.xor, "XOR", {"EN": "XOR", "JP": "XOR"}),
+)}
+
+# 名前 -> 関数
+OPERATIONS = {name: op.func for name, op in OPERATORS.items()}
+
+# CLI やテキスト入力で使える演算子の別名
+ALIASES = {
+    "+": "add", "-": "subtract", "−": "subtract",
+    "*": "multiply", "×": "multiply", "x": "multiply",
+    "/": "divide", "÷": "divide", "//": "divide",
+    "&": "and", "|": "or", "^": "xor",
+}
+
+# 名前・大文字の名前・別名 -> Operator（1回の辞書引きで済むよう先に作っておく）
+_LOOKUP = dict(OPERATORS)
+_LOOKUP.update((name.upper(), op) for name, op in OPERATORS.items())
+_LOOKUP.update((alias, OPERATORS[name]) for alias, name in ALIASES.items())
+
+
+def lookup(name):
+    """演算子名・記号から Operator を引く"""
+    op = _LOOKUP.get(name)
+    if op is None:
+        op = _LOOKUP.get(name.lower())
+        if op is None:
+            raise ValueError(f"Unknown operation: {name!r}")
+    return op
+
+
+def is_operator(name):
+    """演算子名・記号として使える語か"""
+    return name in _LOOKUP or name.lower() in _LOOKUP
+
+
+def resolve_op(name):
+    """演算子名・記号を OPERATIONS のキーにする"""
+    return lookup(name).name
+
+
+@instrument.timed("arithmetic")
+def apply(op, x, y, base=None):
+    """整数 x, y に演算 op を適用する。base があれば論理演算は桁ごと"""
+    try:
+        func = OPERATIONS[op]
+    except KeyError:
+        raise ValueError(f"Unknown operation: {op!r}") from None
+    if base is not None and op in digitwise.LOGIC:
+        return digitwise.apply(op, x, y, base)
+    return func(x, y)
+
+
+def operation(name, base=None):
+    """apply(name, x, y, base) と同じ計算をする2引数の関数"""
+    if base is not None and name in digitwise.LOGIC:
+        return lambda x, y: digitwise.apply(name, x, y, base)
+    return OPERATIONS[name]
+
+
+def evaluate(a, op, b, base=10):
+    """base 進数の文字列 a, b を計算し、結果を int で返す"""
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+    return apply(lookup(op).name, backend.parse_int(a, base),
+                 backend.parse_int(b, base), base)
+
+
+def calculate(a, op, b, base=10):
+    """base 進数の文字列 a, b を計算し、結果を base 進数の文字列で返す"""
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+    text = shift.calculate(lookup(op).name, a, b, base)
+    if text is not None:
+        return text
+    return backend.format_int(evaluate(a, op, b, base), base)
@@ -0,0 +1,60 @@
+"""基数ごとの桁単位の論理演算
+
+AND / OR / XOR を2進数のビット演算ではなく、現在の基数の各桁に対して行う:
+
+    and  桁ごとの min
+    or   桁ごとの max
+    xor  桁ごとの (a + b) mod base（繰り上がりのない足し算）
+
+2進数ではビット演算とまったく同じ結果になる。3, 10, 12 進数では負数に
+桁ごとの意味がないので ValueError にする（2進数は従来どおり Python の規則）。
+
+2つの数の桁の列を「桁a × base + 桁b」(0..143) の1バイトずつの列に重ね、
+bytes.translate で表を引いて結果の数字にするので、桁数によらず C の速度で動く。
+"""
+import operator
+
+from .parse import parse_int
+from .radix import DIGITS, SUPPORTED_BASES, to_base
+from .validate import DIGIT_VALUES
+
+# 桁ごとの論理演算（演算名 -> (桁a, 桁b, 基数) -> 桁）
+LOGIC = {
+    "and": lambda a, b, base: min(a, b),
+    "or": lambda a, b, base: max(a, b),
+    "xor": lambda a, b, base: (a + b) % base,
+}
+_BITWISE = {"and": operator.and_, "or": operator.or_, "xor": operator.xor}
+
+
+def _table(func, base):
+    # 桁a × base + 桁b -> 結果の数字（ASCII）
+    table = bytearray(256)
+    for a in range(base):
+        for b in range(base):
+            table[a * base + b] = ord(DIGITS[func(a, b, base)])
+    return bytes(table)
+
+
+_TABLES = {(op, base): _table(func, base)
+           for op, func in LOGIC.items() for base in SUPPORTED_BASES}
+
+
+def apply(op, x, y, base):
+    """整数 x, y に base 進数の桁ごとの論理演算 op を適用する"""
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+    if op not in LOGIC:
+        raise ValueError(f"Unknown logic operation: {op!r}")
+    if base == 2:
+        return _BITWISE[op](x, y)
+    if x < 0 or y < 0:
+        raise ValueError(f"{op.upper()} needs non-negative operands in base {base}.")
+    a, b = to_base(x, base), to_base(y, base)
+    n = max(len(a), len(b))
+    a = a.rjust(n, "0").encode("ascii").translate(DIGIT_VALUES)
+    b = b.rjust(n, "0").encode("ascii").translate(DIGIT_VALUES)
+    # 各バイトが 桁a × base + 桁b (< 256) になるので繰り上がりは起きない
+    pairs = int.from_bytes(a, "big") * base + int.from_bytes(b, "big")
+    digits = pairs.to_bytes(n, "big").translate(_TABLES[op, base])
+    return parse_int(digits.decode("ascii"), base)
@@ -0,0 +1,289 @@
+"""式の字句解析・構文解析と評価
+
+"(1011 XOR 110) * 21" のような式を一度だけ解析し、定数の部分を畳み込んだうえで
+スタックマシンの命令列にする。変数を含む式は、束縛を変えながら何度でも
+解析し直さずに評価できる。
+
+    e = expr.compile("(x xor 110) * 21", base=3)
+    e.evaluate(x=5)
+    list(e.evaluate_many({"x": v} for v in range(10)))
+
+演算子の優先順位（高い順）は Python と同じ:
+単項 + -、* / × ÷、+ -、and &、xor ^、or |。
+リテラルは式の基数で読み、"3#21" のように「基数#桁」と書けばその基数で読む。
+and / or / xor は式の基数の桁ごとに計算する（core.apply を参照）。
+名前（英字で始まる語）は変数。ただし式の基数で数として読める語（12進数の "AB" など）は数になる。
+"""
+import re
+
+from . import core, fixed
+from .backend import format_int, parse_int
+from .radix import SUPPORTED_BASES
+from .validate import InvalidDigitError
+
+# 二項演算子の優先順位（大きいほど強く結合する）
+_PRECEDENCE = {
+    "or": 1, "xor": 2, "and": 3,
+    "add": 4, "subtract": 4,
+    "multiply": 5, "divide": 5,
+}
+
+# 記号の演算子（語の "x" は変数名と紛らわしいので式では使わない）
+_SYMBOLS = {s: name for s, name in core.ALIASES.items() if not s.isalpha()}
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<word>(?:\d+\#)?[0-9A-Za-z_.]+)
+      | (?P<symbol>//|[-+*/×÷&|^−])
+      | (?P<paren>[()])
+    )""", re.VERBOSE)
+_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# 命令の種類
+_CONST, _LOAD, _NEG, _BINARY = range(4)
+
+
+class Num:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Var:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Neg:
+    __slots__ = ("operand",)
+
+    def __init__(self, operand):
+        self.operand = operand
+
+
+class BinOp:
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+def _literal(word, base, exact):
+    if "#" in word:
+        prefix, word = word.split("#", 1)
+        base = int(prefix)
+        if base not in SUPPORTED_BASES:
+            raise ValueError(f"unsupported base: {base}")
+    if "." in word:
+        if not exact:
+            raise ValueError(f"fractional literal needs a precision: {word!r}")
+        return fixed.parse_value(word, base)
+    return parse_int(word, base)
+
+
+def tokenize(text, base=10, exact=False):
+    """(種類, 値, 位置) を yield する。種類は num / name / op / ( / )"""
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            at = len(text) - len(text[pos:].lstrip())
+            raise ValueError(f"unexpected character {text[at]!r} at {at}")
+        start = m.start(m.lastgroup)
+        pos = m.end()
+        if m.lastgroup == "paren":
+            yield m.group("paren"), None, start
+        elif m.lastgroup == "symbol":
+            yield "op", _SYMBOLS[m.group("symbol")], start
+        else:
+            word = m.group("word")
+            if word.lower() in ("and", "or", "xor"):
+                yield "op", word.lower(), start
+                continue
+            try:
+                value = _literal(word, base, exact)
+            except ValueError as e:
+                if _NAME.fullmatch(word):
+                    yield "name", word, start
+                    continue
+                if isinstance(e, InvalidDigitError):
+                    # 語の中の位置（"3#" の後ろから数える）を式の中の位置にする
+                    at = start + word.find("#") + 1 + e.position
+                    raise InvalidDigitError(e.base, e.char, at) from None
+                raise ValueError(f"{e} at {start}") from None
+            else:
+                yield "num", value, start
+
+
+class _Parser:
+    """優先順位法による構文解析。定数どうしの演算はその場で畳み込む"""
+
+    def __init__(self, text, base, exact):
+        self.text = text
+        self.tokens = list(tokenize(text, base, exact))
+        self.tokens.append(("end", None, len(text)))
+        self.pos = 0
+        self.base = base
+        self.apply = fixed.apply if exact else core.apply
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def error(self, at):
+        if at >= len(self.text.rstrip()):
+            return ValueError("unexpected end of expression")
+        return ValueError(f"unexpected {self.text[at:at + 10]!r} at {at}")
+
+    def parse(self):
+        node = self.expression(1)
+        kind, _, at = self.peek()
+        if kind != "end":
+            raise self.error(at)
+        return node
+
+    def expression(self, min_prec):
+        left = self.unary()
+        while True:
+            kind, op, _ = self.peek()
+            if kind != "op" or _PRECEDENCE[op] < min_prec:
+                return left
+            self.take()
+            right = self.expression(_PRECEDENCE[op] + 1)
+            left = self.fold(op, left, right)
+
+    def unary(self):
+        kind, value, at = self.take()
+        if kind == "op" and value in ("add", "subtract"):
+            operand = self.unary()
+            if value == "add":
+                return operand
+            if isinstance(operand, Num):
+                return Num(-operand.value)
+            return Neg(operand)
+        if kind == "num":
+            return Num(value)
+        if kind == "name":
+            return Var(value)
+        if kind == "(":
+            node = self.expression(1)
+            kind, _, at = self.take()
+            if kind != ")":
+                raise ValueError(f"missing ')' at {at}")
+            return node
+        raise self.error(at)
+
+    def fold(self, op, left, right):
+        if isinstance(left, Num) and isinstance(right, Num):
+            try:
+                return Num(self.apply(op, left.value, right.value, self.base))
+            except (ZeroDivisionError, ValueError):
+                # エラーは評価するときに出す
+                pass
+        return BinOp(op, left, right)
+
+
+def _emit(node, apply):
+    # 後置順の命令列にする（深い木でも再帰しない）
+    code = []
+    stack = [(node, False)]
+    while stack:
+        node, done = stack.pop()
+        if isinstance(node, Num):
+            code.append((_CONST, node.value))
+        elif isinstance(node, Var):
+            code.append((_LOAD, node.name))
+        elif isinstance(node, Neg):
+            if done:
+                code.append((_NEG, None))
+            else:
+                stack.append((node, True))
+                stack.append((node.operand, False))
+        elif done:
+            code.append((_BINARY, apply(node.op)))
+        else:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+    return code
+
+
+class Expression:
+    """解析済みの式。evaluate で変数に値を束縛して評価する"""
+
+    def __init__(self, text, base=10, exact=False):
+        if base not in SUPPORTED_BASES:
+            raise ValueError(f"unsupported base: {base}")
+        self.text = text
+        self.base = base
+        self.exact = exact
+        try:
+            self.ast = _Parser(text, base, exact).parse()
+        except RecursionError:
+            raise ValueError("expression is nested too deeply") from None
+        if exact:
+            self._code = _emit(self.ast, lambda op: (
+                lambda x, y, op=op: fixed.apply(op, x, y, base)))
+        else:
+            self._code = _emit(self.ast, lambda op: core.operation(op, base))
+        self.names = frozenset(arg for code, arg in self._code if code == _LOAD)
+
+    @property
+    def constant(self):
+        """変数を含まず、評価結果が決まっているか"""
+        return len(self._code) == 1 and self._code[0][0] == _CONST
+
+    def evaluate(self, bindings=None, **kwargs):
+        """変数に値（int、exact なら Fraction も可）を束縛して評価する"""
+        env = dict(bindings or {}, **kwargs) if kwargs else bindings or {}
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        try:
+            for code, arg in self._code:
+                if code == _CONST:
+                    push(arg)
+                elif code == _LOAD:
+                    push(env[arg])
+                elif code == _NEG:
+                    stack[-1] = -stack[-1]
+                else:
+                    y = pop()
+                    stack[-1] = arg(stack[-1], y)
+        except KeyError as e:
+            raise ValueError(f"unbound variable: {e.args[0]}") from None
+        return stack[0]
+
+    def evaluate_many(self, rows):
+        """束縛の列それぞれで評価した結果を yield する"""
+        for row in rows:
+            yield self.evaluate(row)
+
+    def format(self, value, precision=fixed.DEFAULT_PRECISION):
+        """結果を式の基数の文字列にする"""
+        if self.exact:
+            return fixed.format_value(value, self.base, precision)
+        return format_int(value, self.base)
+
+    def __repr__(self):
+        return f"Expression({self.text!r}, base={self.base})"
+
+
+def compile(text, base=10, exact=False):
+    """式を解析して Expression を返す。exact なら割り算は切り捨てず正確に行う"""
+    return Expression(text, base, exact)
+
+
+def evaluate(text, base=10, **bindings):
+    """式を一度だけ評価する"""
+    return Expression(text, base).evaluate(bindings)
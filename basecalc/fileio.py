@@ -0,0 +1,93 @@
+"""数のファイルの読み込み・書き出し
+
+1つのファイルに1つの数（先頭の +/- 可、前後の空白・改行は無視）を base 進数で書く。
+読み込みはファイルを mmap し、検証は validate でチャンクごとに1回走査するだけ、
+int への変換も parse と同じ積の木でマップ上の小さな範囲を int() で読むので、
+ファイル全体のコピーを作らない。書き出しは上位桁からチャンクごとに変換して書く。
+
+    value = fileio.read_number("big.txt", 3)
+    fileio.write_number("big_dec.txt", value, 10)
+"""
+import mmap
+import os
+import re
+
+from .backend import iter_format
+from .parse import _LEAF, _combine
+from .radix import SUPPORTED_BASES
+from .validate import find_invalid
+
+_SPACE = b" \t\r\n\f\v"
+_LEADING_SPACE = re.compile(rb"\s*")
+
+# 書き出しのバッファサイズ
+BUFFER_SIZE = 1 << 20
+
+
+class NumberFileError(ValueError):
+    """ファイルの内容が base 進数の数として読めない"""
+
+
+def _check_base(base):
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+
+
+def parse_buffer(buf, base, name="input"):
+    """bytes・mmap などの base 進数の数を int にする
+
+    不正な文字があれば、その位置を示して NumberFileError を送出する。
+    """
+    _check_base(base)
+    start = _LEADING_SPACE.match(buf).end()
+    end = len(buf)
+    while end > start and buf[end - 1] in _SPACE:
+        end -= 1
+    sign = 1
+    if start < end and buf[start] in b"+-":
+        sign = -1 if buf[start] == ord("-") else 1
+        start += 1
+    if start == end:
+        raise NumberFileError(f"{name}: no digits")
+    pos = find_invalid(buf, base, start, end)
+    if pos >= 0:
+        char = buf[pos:pos + 1].decode("latin-1")
+        raise NumberFileError(f"{name}: invalid digit {char!r} for base {base} "
+                              f"at offset {pos}")
+    if base == 2:
+        # 2進数の int() は線形時間なので、そのまま読む（_LEAF に 2 はない）
+        return sign * int(buf[start:end], 2)
+    return sign * _combine(buf, start, end, base, _LEAF[base])
+
+
+def read_number(path, base):
+    """ファイルの base 進数の数を mmap して読む"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise NumberFileError(f"{path}: no digits")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return parse_buffer(buf, base, path)
+
+
+def write_digits(f, num, base):
+    """テキストファイル f に num を base 進数で書き、書いた文字数を返す"""
+    _check_base(base)
+    count = 0
+    for chunk in iter_format(num, base):
+        f.write(chunk)
+        count += len(chunk)
+    return count
+
+
+def write_number(path, num, base):
+    """num を base 進数でファイルに書き出し（末尾に改行）、桁数（符号を含む）を返す"""
+    with open(path, "w", encoding="ascii", newline="\n",
+              buffering=BUFFER_SIZE) as f:
+        count = write_digits(f, num, base)
+        f.write("\n")
+    return count
+
+
+def convert_file(src, dst, from_base, to_base):
+    """from_base 進数のファイル src を to_base 進数にして dst に書き出す"""
+    return write_number(dst, read_number(src, from_base), to_base)
@@ -0,0 +1,78 @@
+"""基数小数（0.1 (3進数) や 0.6 (12進数) など）
+
+値は Fraction で正確に持ち、表示するときだけ小数点以下を指定の桁数で切り捨てる。
+小数部 p 桁は「余り × base**p // 分母」の1回の割り算と1回の基数変換で求めるので、
+1桁ずつ余りを掛けて割る方法と違い、p が数千桁でも二次時間にならない。
+"""
+from fractions import Fraction
+
+from . import core
+from .backend import floor_divide, parse_int, to_base
+
+# GUI が他の基数での表記に使う既定の小数点以下の桁数
+DEFAULT_PRECISION = 10
+# 小数点以下の桁数の上限（GUI の設定欄と計算サービスの要求）
+MAX_PRECISION = 10000
+
+
+def normalize(value):
+    """整数になる Fraction は int にする"""
+    if isinstance(value, Fraction) and value.denominator == 1:
+        return value.numerator
+    return value
+
+
+def parse_value(s: str, base: int):
+    """'-12.A' のような base 進数を正確な値にする（小数点がなければ int）"""
+    if "." not in s:
+        return parse_int(s, base)
+    head, _, frac = s.partition(".")
+    sign = head[:1] if head[:1] in ("+", "-") else ""
+    digits = head[len(sign):] + frac
+    try:
+        if not digits:
+            raise ValueError
+        # 小数点を除いた桁の検証は parse_int に任せる（2つ目の '.' もここで弾かれる）
+        num = parse_int(sign + digits, base)
+    except ValueError:
+        raise ValueError(f"invalid literal for base {base}: {s!r}") from None
+    return normalize(Fraction(num, base ** len(frac)))
+
+
+def format_value(value, base: int, precision: int) -> str:
+    """値を base 進数で表す。小数部は precision 桁で切り捨て、末尾の 0 は省く"""
+    value = normalize(value)
+    if isinstance(value, int):
+        sign, num, den = "-" if value < 0 else "", abs(value), 1
+    else:
+        sign = "-" if value < 0 else ""
+        num, den = abs(value.numerator), value.denominator
+    q, r = divmod(num, den)
+    frac = ""
+    if r and precision > 0:
+        frac = floor_divide(r * base ** precision, den)
+        frac = to_base(frac, base).rjust(precision, "0").rstrip("0")
+    if not q and not frac:
+        return "0"
+    text = to_base(q, base)
+    return f"{sign}{text}.{frac}" if frac else sign + text
+
+
+def apply(op, x, y, base=None):
+    """core.apply と同じ演算を int / Fraction に対して行う（割り算は正確な商）"""
+    if op == "divide":
+        if y == 0:
+            raise ZeroDivisionError("Division by zero.")
+        return normalize(Fraction(x) / y)
+    if op in ("and", "or", "xor"):
+        x, y = normalize(x), normalize(y)
+        if not (isinstance(x, int) and isinstance(y, int)):
+            raise ValueError(f"{op} needs integer operands")
+    return normalize(core.apply(op, x, y, base))
+
+
+def calculate(a, op, b, base=10, precision=DEFAULT_PRECISION):
+    """core.calculate の小数版。結果は小数点以下 precision 桁で切り捨てる"""
+    name = core.resolve_op(op)
+    value = apply(name, parse_value(a, base), parse_value(b, base), base)
+    return format_value(value, base, precision)
@@ -0,0 +1,260 @@
+"""計測（既定では無効）
+
+遅い操作が解析・演算・基数変換・Qt の再描画のどこで時間を使っているかを見るため、
+段階（stage）ごとの時間と回数、カウンタ、オペランドの桁数のヒストグラムを記録する。
+無効のときは、計測する関数の呼び出しごとにフラグを1回見るだけで何も記録しない。
+
+環境変数 BASECALC_PROFILE で有効にする（GUI では Ctrl+Shift+D のデバッグ画面でも切り替えられる）:
+
+    BASECALC_PROFILE=1            計測だけ（snapshot() やデバッグ画面で見る）
+    BASECALC_PROFILE=stats.json   終了時に統計を JSON で書き出す
+    BASECALC_PROFILE=run.prof     cProfile も動かし、終了時に pstats 形式で書き出す
+                                  （統計の JSON は run.prof.json）
+
+    python -m pstats run.prof
+
+cProfile が見るのは有効にしたスレッド（GUI なら UI スレッド）だけ。
+プロセスプール（CLI の -j、計算サービスの巨大な要求、GUI の巨大な計算）の
+子プロセスは計測しない。子プロセスは環境変数を引き継ぐが、設定するのは
+最初に読んだプロセス（親）だけなので、親の統計にはプールでの計算は入らない。
+
+起動時間を増やさないよう、cProfile・pstats・json は使うときに読み込む。
+"""
+import atexit
+import os
+import threading
+import time
+from functools import wraps
+
+ENV_VAR = "BASECALC_PROFILE"
+# 環境変数を読んで計測を設定したプロセスの PID（子プロセスに引き継がれる）
+_OWNER_VAR = "BASECALC_PROFILE_PID"
+
+_enabled = False
+_lock = threading.Lock()
+_timers = {}        # stage -> [回数, 合計秒, 最大秒]
+_counters = {}      # name -> 回数
+_histograms = {}    # name -> {桁数の上限（2のべき）: 回数}
+_profiler = None
+_profiling = False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL = _NullTimer()
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def profiling():
+    return _profiling
+
+
+def has_profile():
+    """書き出せる cProfile の結果があるか"""
+    return _profiler is not None
+
+
+def start_profile():
+    """cProfile を（このスレッドで）動かし始める。前の結果には追記する"""
+    global _profiler, _profiling
+    if _profiler is None:
+        import cProfile
+        _profiler = cProfile.Profile()
+    _profiler.enable()
+    _profiling = True
+
+
+def stop_profile():
+    global _profiling
+    if _profiler is not None:
+        _profiler.disable()
+    _profiling = False
+
+
+def reset():
+    """記録した統計と cProfile の結果を捨てる"""
+    global _profiler
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+        _histograms.clear()
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler = None
+    if _profiling:
+        start_profile()
+
+
+def record(stage, seconds):
+    with _lock:
+        t = _timers.get(stage)
+        if t is None:
+            _timers[stage] = [1, seconds, seconds]
+        else:
+            t[0] += 1
+            t[1] += seconds
+            if seconds > t[2]:
+                t[2] = seconds
+
+
+class _Timer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.stage, time.perf_counter() - self.start)
+
+
+def timer(stage):
+    """with timer("parse"): の中の時間を stage に記録する（無効なら何もしない）"""
+    return _Timer(stage) if _enabled else _NULL
+
+
+def timed(stage):
+    """関数の実行時間を stage に記録するデコレータ"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name, digits):
+    """桁数 digits をヒストグラム name の「2のべきの上限」の区間に数える"""
+    if _enabled:
+        bucket = 1 << (digits - 1).bit_length() if digits > 0 else 0
+        with _lock:
+            hist = _histograms.setdefault(name, {})
+            hist[bucket] = hist.get(bucket, 0) + 1
+
+
+def snapshot():
+    """記録した統計を JSON にできる dict で返す（時間はミリ秒）"""
+    with _lock:
+        timers = {
+            stage: {
+                "count": n,
+                "total_ms": total * 1000,
+                "mean_ms": total / n * 1000,
+                "max_ms": longest * 1000,
+            }
+            for stage, (n, total, longest) in sorted(_timers.items())
+        }
+        counters = dict(sorted(_counters.items()))
+        histograms = {
+            name: {f"<={bucket}": n for bucket, n in sorted(hist.items())}
+            for name, hist in sorted(_histograms.items())
+        }
+    return {
+        "enabled": _enabled,
+        "profiling": _profiling,
+        "timers": timers,
+        "counters": counters,
+        "histograms": histograms,
+    }
+
+
+def dump_json(path, extra=None):
+    """snapshot()（と extra の項目）を JSON ファイルに書き出す"""
+    import json
+
+    data = snapshot()
+    if extra:
+        data.update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+        f.write("\n")
+
+
+def _profile_stats(stream=None):
+    import pstats
+
+    if _profiler is None:
+        raise ValueError("profiling has not been started")
+    # pstats は結果を取り出すときに cProfile を止めるので、動かしていたら再開する
+    stats = pstats.Stats(_profiler, stream=stream)
+    if _profiling:
+        _profiler.enable()
+    return stats
+
+
+def dump_profile(path):
+    """cProfile の結果を pstats 形式で書き出す（python -m pstats path で読める）"""
+    _profile_stats().dump_stats(path)
+
+
+def profile_report(limit=30, sort="cumulative"):
+    """cProfile の結果の上位 limit 件を文字列で返す"""
+    import io
+
+    out = io.StringIO()
+    _profile_stats(out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def _dump_at_exit(path):
+    if path.endswith(".json"):
+        dump_json(path)
+        return
+    stop_profile()
+    dump_profile(path)
+    dump_json(path + ".json")
+
+
+def _configure(value):
+    if not value or value == "0":
+        return
+    owner = os.environ.get(_OWNER_VAR)
+    if owner is not None and owner != str(os.getpid()):
+        # プロセスプールの子プロセス: 同じファイルへの書き出しを登録しない
+        return
+    os.environ[_OWNER_VAR] = str(os.getpid())
+    enable()
+    if value == "1":
+        return
+    if not value.endswith(".json"):
+        start_profile()
+    atexit.register(_dump_at_exit, value)
+
+
+_configure(os.environ.get(ENV_VAR, ""))
@@ -0,0 +1,257 @@
+"""入力中のオペランド
+
+桁を押すたびに文字列全体を int() し直すと、N 桁の入力全体で O(N²) 以上になる。
+Operand は桁の追加（value * base + d）と削除（value // base）のたびに
+値を更新し、他の基数での表記は表示されるときにだけ変換してキャッシュする。
+大きな数の変換結果は cache.conversions にも登録し、同じ値を再び表示するときに使う。
+小数点を含む入力は、小数点を除いた桁の値と小数点以下の桁数で持つ。
+計算結果から作ったオペランドは値だけを持ち、桁の列は編集されるときに作る。
+"""
+from fractions import Fraction
+
+from . import fixed, radix
+from .cache import conversions
+from .radix import DIGITS
+from .validate import DIGIT_VALUES, INVALID
+
+
+class Operand:
+    """base 進数で入力中の数値（桁の列と、その値）"""
+
+    # 小数を他の基数で表すときの小数点以下の桁数
+    precision = fixed.DEFAULT_PRECISION
+
+    def __init__(self, base, text=""):
+        self.base = base
+        self.negative = False
+        self.point = None      # 小数点以下の桁数（小数点がなければ None）
+        self._digits = []      # 入力された桁（削除用のスタックを兼ねる。None なら未作成）
+        self._magnitude = 0
+        self._text = ""
+        self._renders = {}
+        self._previews = {}
+        self._version = 0
+        if text:
+            self._load(text)
+
+    @classmethod
+    def from_value(cls, base, value, text=None):
+        """計算結果など、値（int）が分かっている数からオペランドを作る
+
+        text（base 進数の表記）がなければ、表示されるときに変換する。
+        """
+        op = cls(base)
+        op.negative = value < 0
+        op._magnitude = abs(value)
+        op._digits = None
+        op._text = text
+        return op
+
+    def rebase(self, base):
+        """同じ整数値を base 進数で持つオペランド（表記は必要になるまで変換しない）"""
+        if self.point is not None:
+            raise ValueError("cannot rebase a fractional operand")
+        if not self:
+            return Operand(base)
+        op = Operand.from_value(base, self.value, self.cached_render(base))
+        op.precision = self.precision
+        if self._text is not None:
+            # 元の基数に戻したときに変換し直さなくて済むよう、元の表記も渡しておく
+            op._renders[self.base] = self._text
+        return op
+
+    def copy(self):
+        """同じ値のオペランド（変換済みの表記も引き継ぐ）"""
+        op = Operand(self.base)
+        op.negative = self.negative
+        op.point = self.point
+        op.precision = self.precision
+        op._magnitude = self._magnitude
+        op._digits = None if self._digits is None else list(self._digits)
+        op._text = self._text
+        op._renders = dict(self._renders)
+        op._previews = dict(self._previews)
+        return op
+
+    def _digit_list(self):
+        if self._digits is None:
+            self._digits = list(self.text.lstrip("-"))
+        return self._digits
+
+    def _load(self, text):
+        head, dot, frac = text.partition(".")
+        value = conversions.parse_int(head + frac, self.base)
+        self.negative = value < 0
+        self._magnitude = abs(value)
+        self._digits = list(text.lstrip("+-").upper())
+        self.point = len(frac) if dot else None
+        self._text = None
+
+    def _changed(self):
+        self._text = None
+        self._renders.clear()
+        self._previews.clear()
+        self._version += 1
+
+    def push(self, key):
+        """桁（または小数点）を1つ末尾に追加する"""
+        if key == ".":
+            if self.point is not None:
+                return
+            digits = self._digit_list()
+            if not digits:
+                digits.append("0")
+            digits.append(".")
+            self.point = 0
+            self._changed()
+            return
+        d = INVALID
+        if len(key) == 1 and key.isascii():
+            d = DIGIT_VALUES[ord(key)]
+        if d >= self.base:
+            raise ValueError(f"invalid digit for base {self.base}: {key!r}")
+        self._digit_list().append(DIGITS[d])
+        self._magnitude = self._magnitude * self.base + d
+        if self.point is not None:
+            self.point += 1
+        self._changed()
+
+    def pop(self):
+        """末尾の桁（または小数点）を1つ削除する"""
+        digits = self._digit_list()
+        if not digits:
+            return
+        if digits.pop() == ".":
+            self.point = None
+        else:
+            self._magnitude //= self.base
+            if self.point:
+                self.point -= 1
+        if not digits:
+            self.negative = False
+        self._changed()
+
+    @property
+    def fractional(self):
+        """小数点以下に桁があるか"""
+        return bool(self.point)
+
+    @property
+    def value(self):
+        """int（小数点以下に桁があれば Fraction）"""
+        value = -self._magnitude if self.negative else self._magnitude
+        if self.point:
+            return fixed.normalize(Fraction(value, self.base ** self.point))
+        return value
+
+    @property
+    def version(self):
+        """桁が変わるたびに増える番号（別スレッドで変換した結果の照合用）"""
+        return self._version
+
+    def bit_length(self):
+        return self._magnitude.bit_length()
+
+    @property
+    def rendered(self):
+        """自分の基数での表記がもうあるか（text を読んでも変換が走らないか）"""
+        return self._text is not None or self._digits is not None
+
+    @property
+    def text(self):
+        if self._text is None:
+            if self._digits is None:
+                self._text = conversions.format_int(self.value, self.base)
+            else:
+                sign = "-" if self.negative else ""
+                self._text = sign + "".join(self._digits)
+        return self._text
+
+    def render(self, base):
+        """他の基数での表記（符号付き）。値が変わるまでキャッシュする"""
+        if base == self.base:
+            return self.text
+        if base not in self._renders:
+            if self.point:
+                self._renders[base] = fixed.format_value(self.value, base,
+                                                         self.precision)
+            else:
+                self._renders[base] = conversions.format_int(self.value, base)
+        return self._renders[base]
+
+    def cached_render(self, base):
+        """変換済みならその表記、まだなら None"""
+        if base == self.base:
+            if not self.rendered:
+                self._text = conversions.lookup(self.value, base)
+            return self._text if self._digits is None else self.text
+        if self.point:
+            # 手で入力した小数は小さいので、その場で変換する
+            return self.render(base)
+        text = self._renders.get(base)
+        if text is None:
+            text = conversions.lookup(self.value, base)
+            if text is not None:
+                self._renders[base] = text
+        return text
+
+    def set_precision(self, precision):
+        """小数を他の基数で表すときの桁数を変える"""
+        self.precision = precision
+        if self.point:
+            self._renders.clear()
+            self._previews.clear()
+
+    def cached_preview(self, base, head, tail):
+        """preview の結果が手元にあれば返し、なければ None"""
+        key = (base, head, tail)
+        if key not in self._previews:
+            text = self.cached_render(base)
+            if text is None:
+                return self._slice_preview(base, head, tail)
+            digits = text.lstrip("-")
+            if len(digits) <= head + tail:
+                self._previews[key] = (digits, "", len(digits))
+            else:
+                self._previews[key] = (digits[:head], digits[len(digits) - tail:],
+                                       len(digits))
+        return self._previews[key]
+
+    def _slice_preview(self, base, head, tail):
+        # 同じ基数でもっと多くの桁を求めた preview があれば、そこから切り出す
+        for (b, h, t), (top, low, count) in list(self._previews.items()):
+            if b == base and h >= head and t >= tail and low:
+                result = top[:head], low[len(low) - tail:], count
+                self._previews[(base, head, tail)] = result
+                return result
+        return None
+
+    def preview(self, base, head, tail):
+        """base 進数での (上位 head 桁, 下位 tail 桁, 桁数)。全桁は変換しない"""
+        result = self.cached_preview(base, head, tail)
+        if result is None:
+            result = radix.preview(self._magnitude, base, head, tail)
+            self._previews[(base, head, tail)] = result
+            if base == self.base and not result[1]:
+                # 全桁が求まったので、自分の基数での表記として覚えておく
+                self._text = "-" + result[0] if self.negative else result[0]
+        return result
+
+    def store_preview(self, base, head, tail, result, version):
+        """別スレッドで求めた preview を登録する（その間に値が変わっていれば捨てる）"""
+        if version == self._version:
+            self._previews[(base, head, tail)] = result
+
+    def __bool__(self):
+        return self._digits is None or bool(self._digits)
+
+    def __len__(self):
+        if self._digits is None:
+            if self._text is None:
+                # 表記がまだなければ、変換せずに桁数だけを求める
+                return radix.digit_count(self._magnitude, self.base)
+            return len(self._text) - self.negative
+        return len(self._digits)
+
+    def __str__(self):
+        return self.text
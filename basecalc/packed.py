@@ -0,0 +1,171 @@
+"""桁を詰めて持つ数と、桁ごとの論理演算の一括カーネル（要 NumPy）
+
+1バイトに base**k <= 256 となる k 桁を詰める（2進数 8 桁、3進数 5 桁、
+10・12進数 2 桁）。バイトは下の桁のまとまりから順に並べるので、
+桁数の違う2つの数も先頭のバイトからそのまま揃う。
+
+桁ごとの演算は「バイトa × 256 + バイトb」-> 結果のバイトの 65536 項目の表を
+np.take で引くだけなので、1バイトで k 桁ずつ処理する。配列は固定サイズの
+チャンクごとに処理するので、np.memmap の入出力ならギガバイト単位の数も扱える。
+NumPy が必要なので basecalc からは自動で import しない。
+
+    from basecalc import packed
+    a = packed.PackedDigits.from_int(x, 3)
+    int(a & packed.PackedDigits.from_int(y, 3))
+"""
+import numpy as np
+
+from .digitwise import LOGIC
+from .parse import parse_int
+from .radix import DIGITS, SUPPORTED_BASES, to_base
+from .validate import DIGIT_VALUES
+
+# 1バイトに詰める桁数
+PER_BYTE = {2: 8, 3: 5, 10: 2, 12: 2}
+# 一度に処理するバイト数（作業用の配列の大きさを抑える）
+CHUNK_BYTES = 1 << 22
+
+_CHARS = np.frombuffer(DIGITS.encode("ascii"), dtype=np.uint8)
+_BITWISE = {"and": np.bitwise_and, "or": np.bitwise_or, "xor": np.bitwise_xor}
+_TABLES = {}
+
+
+def _check_base(base):
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+
+
+def _powers(base):
+    return base ** np.arange(PER_BYTE[base], dtype=np.int64)
+
+
+def _table(op, base):
+    """(バイトa << 8 | バイトb) -> 結果のバイト"""
+    table = _TABLES.get((op, base))
+    if table is None:
+        powers = _powers(base)
+        # 各バイトの桁（下の桁から）。base**k 以上のバイトは現れない
+        d = np.arange(256)[:, None] // powers % base
+        a, b = d[:, None, :], d[None, :, :]
+        if op == "and":
+            r = np.minimum(a, b)
+        elif op == "or":
+            r = np.maximum(a, b)
+        else:
+            r = (a + b) % base
+        table = (r * powers).sum(axis=-1).astype(np.uint8).ravel()
+        _TABLES[op, base] = table
+    return table
+
+
+class PackedDigits:
+    """base 進数の非負整数を、1バイトに PER_BYTE[base] 桁ずつ詰めて持つ"""
+
+    __slots__ = ("base", "data", "length")
+
+    def __init__(self, base, data, length=None):
+        _check_base(base)
+        self.base = base
+        # data は下の桁のまとまりからの uint8 配列（np.memmap でもよい）
+        self.data = data
+        self.length = len(data) * PER_BYTE[base] if length is None else length
+
+    @classmethod
+    def from_digits(cls, digits, base):
+        """桁の値（上の桁から）の uint8 配列を詰める"""
+        _check_base(base)
+        k = PER_BYTE[base]
+        digits = np.asarray(digits, dtype=np.uint8)
+        n = len(digits)
+        rev = np.zeros(-(-n // k) * k, dtype=np.uint8)
+        rev[:n] = digits[::-1]
+        if base == 2:
+            data = np.packbits(rev, bitorder="little")
+        else:
+            data = (rev.reshape(-1, k) @ _powers(base)).astype(np.uint8)
+        return cls(base, data, n)
+
+    @classmethod
+    def from_int(cls, num, base):
+        if num < 0:
+            raise ValueError("num must be non-negative")
+        if base == 2:
+            raw = num.to_bytes(-(-num.bit_length() // 8), "little")
+            return cls(2, np.frombuffer(raw, dtype=np.uint8), num.bit_length())
+        raw = to_base(num, base).encode("ascii").translate(DIGIT_VALUES)
+        return cls.from_digits(np.frombuffer(raw, dtype=np.uint8), base)
+
+    def digits(self):
+        """桁の値（上の桁から）の uint8 配列"""
+        if self.base == 2:
+            rev = np.unpackbits(self.data, bitorder="little")
+        else:
+            rev = (self.data[:, None] // _powers(self.base).astype(np.uint8)
+                   % self.base).ravel()
+        return rev[:self.length][::-1]
+
+    def __int__(self):
+        if self.base == 2:
+            return int.from_bytes(self.data.tobytes(), "little")
+        if not self.length:
+            return 0
+        return parse_int(str(self), self.base)
+
+    __index__ = __int__
+
+    def __str__(self):
+        text = _CHARS[self.digits()].tobytes().decode("ascii").lstrip("0")
+        return text or "0"
+
+    def __repr__(self):
+        return f"PackedDigits(base={self.base}, length={self.length})"
+
+    def __len__(self):
+        return self.length
+
+    def __and__(self, other):
+        return apply("and", self, other)
+
+    def __or__(self, other):
+        return apply("or", self, other)
+
+    def __xor__(self, other):
+        return apply("xor", self, other)
+
+
+def apply(op, a, b, out=None, chunk=CHUNK_BYTES):
+    """詰めた2つの数に桁ごとの論理演算 op を適用する
+
+    out には結果を書き込む uint8 配列（np.memmap など）を渡せる。
+    """
+    if op not in LOGIC:
+        raise ValueError(f"Unknown logic operation: {op!r}")
+    if a.base != b.base:
+        raise ValueError("operands must have the same base")
+    if len(a.data) < len(b.data):
+        a, b = b, a
+    x, y = a.data, b.data
+    n, m = len(x), len(y)
+    if out is None:
+        out = np.empty(n, dtype=np.uint8)
+    elif len(out) != n:
+        raise ValueError(f"out must have {n} bytes")
+    bitwise = _BITWISE[op] if a.base == 2 else None
+    table = None if bitwise else _table(op, a.base)
+    for i in range(0, m, chunk):
+        j = min(i + chunk, m)
+        if bitwise:
+            bitwise(x[i:j], y[i:j], out=out[i:j])
+        else:
+            idx = x[i:j].astype(np.uint16)
+            idx <<= 8
+            idx |= y[i:j]
+            np.take(table, idx, out=out[i:j])
+    # 短い方の上の桁は 0: min は 0、max と和はもう一方の桁そのまま
+    for i in range(m, n, chunk):
+        j = min(i + chunk, n)
+        if op == "and":
+            out[i:j] = 0
+        else:
+            out[i:j] = x[i:j]
+    return PackedDigits(a.base, out, max(a.length, b.length))
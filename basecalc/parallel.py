@@ -0,0 +1,137 @@
+"""プロセスプールによる並列計算
+
+巨大なオペランドの乗算や基数変換は1コアで走り、GUI のイベントループを止めてしまう。
+ここでは大きな仕事を ProcessPoolExecutor に回し、結果を Future で返す。
+基数変換は分割統治の上位数段をここで割り、独立した下位チャンクを各コアで変換する。
+"""
+import atexit
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import backend, core, radix
+
+# これ以上のビット数のオペランドはプロセスプールで計算する
+PARALLEL_BITS = 1 << 18
+
+_pool = None
+_dispatcher = None
+
+
+def workers():
+    return os.cpu_count() or 1
+
+
+def get_pool(max_workers=None):
+    """共有のプロセスプール（初回の呼び出しで起動し、以後は同じものを返す）"""
+    global _pool
+    if _pool is None:
+        # multiprocessing の import は重いので、プールを初めて使うときまで遅らせる
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # Qt などスレッドを持つ親から fork しないよう spawn を使う
+        ctx = multiprocessing.get_context("spawn")
+        _pool = ProcessPoolExecutor(max_workers=max_workers or workers(),
+                                    mp_context=ctx)
+        # atexit は登録と逆順に呼ばれる。後から import した multiprocessing の
+        # 終了処理より先にプールを止めるよう登録し直す
+        atexit.unregister(shutdown)
+        atexit.register(shutdown)
+    return _pool
+
+
+def _get_dispatcher():
+    # プールへの仕事の投入と結果の結合を行うスレッド
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = ThreadPoolExecutor(max_workers=1,
+                                         thread_name_prefix="basecalc")
+    return _dispatcher
+
+
+def shutdown():
+    global _pool, _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.shutdown(wait=False, cancel_futures=True)
+        _dispatcher = None
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+atexit.register(shutdown)
+
+
+def is_large(*values):
+    """どれかの値がプールに回すべき大きさか"""
+    return any(abs(v).bit_length() >= PARALLEL_BITS for v in values)
+
+
+def _piece_to_base(num, base, width):
+    s = backend.to_base(num, base)
+    return s.rjust(width, "0") if width else s
+
+
+def _split(num, base, parts):
+    """num を上位から並んだ (値, 桁幅) の列に割る。先頭の桁幅は 0（詰めない）"""
+    leaf = radix._LEAF[base]
+    items = [(num, radix._top_level(num, base), False)]
+    while len(items) < parts and items[0][1] >= 0:
+        split = []
+        for n, k, pad in items:
+            hi, lo = radix.fast_divmod(n, radix.power(base, k))
+            if hi or pad:
+                split.append((hi, k - 1, pad))
+                split.append((lo, k - 1, True))
+            else:
+                split.append((lo, k - 1, False))
+        items = split
+    return [(n, leaf << (k + 1) if pad else 0) for n, k, pad in items]
+
+
+def parallel_to_base(num, base, parts=None):
+    """radix.to_base と同じ結果を、下位チャンクをプールで並列に変換して返す"""
+    if num < 0:
+        raise ValueError("num must be non-negative")
+    if (base == 2 or num.bit_length() < PARALLEL_BITS or workers() == 1
+            or backend.get().native):
+        # GMP の変換は分割して並べるより1回で変換する方が速い
+        return backend.to_base(num, base)
+    pieces = _split(num, base, parts or workers())
+    nums, widths = zip(*pieces)
+    return "".join(get_pool().map(_piece_to_base, nums,
+                                  [base] * len(nums), widths))
+
+
+def parallel_format_int(num, base):
+    sign = "-" if num < 0 else ""
+    return sign + parallel_to_base(abs(num), base)
+
+
+def _calculate(op, x, y, base):
+    r = get_pool().submit(core.apply, op, x, y, base).result()
+    return r, parallel_format_int(r, base)
+
+
+def submit_calculation(op, x, y, base):
+    """演算と結果の基数変換をプールで行い、(値, 文字列) の Future を返す
+
+    ZeroDivisionError などの例外は Future.result() で送出される。
+    """
+    return _get_dispatcher().submit(_calculate, op, x, y, base)
+
+
+def imap_batches(func, batches, *args, window=None):
+    """func(batch, *args) をプールで並列に実行し、結果を投入順に yield する
+
+    同時に投入する仕事は window 個までなので、入力がいくら長くてもメモリは一定。
+    """
+    pool = get_pool()
+    window = window or 2 * workers()
+    pending = deque()
+    for batch in batches:
+        pending.append(pool.submit(func, batch, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
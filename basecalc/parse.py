@@ -0,0 +1,53 @@
+"""2,3,10,12進数の文字列 → int 変換
+
+int(s, base) は 2 のべき乗以外の基数では桁数の二乗の時間がかかり、
+sys.int_max_str_digits（既定 4300 桁）を超えると ValueError になる。
+ここでは桁を固定幅のチャンクに区切って小さな int() で読み、
+radix.power のべき乗で平衡な積の木を組み立てて結合する。
+"""
+from .radix import SUPPORTED_BASES, _LEAF, power
+from .validate import _ALLOWED, InvalidDigitError, find_invalid
+
+# これ以下の桁数なら int() をそのまま使う（int_max_str_digits より十分小さい）
+_INT_LIMIT = 3000
+
+
+def _combine(s, start, end, base, leaf):
+    n = end - start
+    if n <= _INT_LIMIT:
+        return int(s[start:end], base)
+    # 下位側を leaf * 2**k 桁にして上位側を再帰的に結合する
+    k = 0
+    while leaf << (k + 1) < n:
+        k += 1
+    mid = end - (leaf << k)
+    hi = _combine(s, start, mid, base, leaf)
+    lo = _combine(s, mid, end, base, leaf)
+    return hi * power(base, k) + lo
+
+
+def split_digits(s: str, base: int):
+    """base 進数の文字列（先頭の +/- 可）を検証し、(符号 1/-1, 数字列) を返す"""
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+    sign = 1
+    digits = s
+    if digits[:1] in ("-", "+"):
+        sign = -1 if digits[0] == "-" else 1
+        digits = digits[1:]
+    if not digits:
+        raise ValueError(f"invalid literal for base {base}: {s!r}")
+    # int() は '_' や空白も受け付けるので、数字だけかを先に調べる
+    raw = digits.encode("ascii", "replace")
+    if raw.translate(None, _ALLOWED[base]):
+        pos = find_invalid(raw, base)
+        raise InvalidDigitError(base, digits[pos], pos + len(s) - len(digits))
+    return sign, digits
+
+
+def parse_int(s: str, base: int) -> int:
+    """base 進数の文字列（先頭の +/- 可）を int にする。桁数の上限はない。"""
+    sign, digits = split_digits(s, base)
+    if base == 2:
+        return sign * int(digits, 2)
+    return sign * _combine(digits, 0, len(digits), base, _LEAF[base])
@@ -0,0 +1,265 @@
+"""基数変換エンジン
+
+% と // で1桁ずつ取り出す方法は桁数 n に対して O(n²) になる。
+ここでは base**(w * 2**k) のべき乗で数を上下に分割して再帰的に変換し、
+固定幅のチャンクを連結する。大きな割り算は Burnikel-Ziegler 法で
+乗算（CPython の Karatsuba）に落とすので、全体が準二次時間になる。
+"""
+
+import math
+
+DIGITS = "0123456789AB"
+SUPPORTED_BASES = (2, 3, 10, 12)
+
+# これ以下のビット数なら CPython の divmod（筆算）の方が速い
+_DIV_LIMIT = 4000
+
+# 葉チャンクの桁数（base**leaf がおよそ 1000 bit）
+_LEAF = {3: 630, 10: 300, 12: 279}
+_LEAF_BITS = 1000
+
+# 葉の変換で一度に取り出す桁数と、その桁数の文字列表
+_STEP = {3: 7, 12: 3}
+_TABLES = {}
+
+# base -> [base**leaf, base**(2*leaf), base**(4*leaf), ...]
+_POWERS = {}
+
+# 2進数を一度に文字列にするバイト数
+_BINARY_STEP = 1 << 13
+
+# iter_digits が既定で返すチャンクの桁数
+CHUNK_DIGITS = 1 << 16
+
+
+def _table(base):
+    if base not in _TABLES:
+        width = _STEP[base]
+        table = []
+        for n in range(base ** width):
+            chars = []
+            for _ in range(width):
+                n, d = divmod(n, base)
+                chars.append(DIGITS[d])
+            table.append("".join(reversed(chars)))
+        _TABLES[base] = table
+    return _TABLES[base]
+
+
+def power(base, k):
+    """base**(leaf * 2**k) をキャッシュ付きで返す"""
+    pows = _POWERS.setdefault(base, [])
+    if not pows:
+        pows.append(base ** _LEAF[base])
+    while len(pows) <= k:
+        pows.append(pows[-1] * pows[-1])
+    return pows[k]
+
+
+def clear_cache():
+    """べき乗キャッシュを破棄する（巨大な数を扱った後のメモリ解放用）"""
+    _POWERS.clear()
+
+
+def _div2n1n(a, b, n):
+    """a < 2**n * b, b が n bit のとき (a // b, a % b) を返す"""
+    if a.bit_length() - n <= _DIV_LIMIT:
+        return divmod(a, b)
+    pad = n & 1
+    if pad:
+        a <<= 1
+        b <<= 1
+        n += 1
+    half = n >> 1
+    mask = (1 << half) - 1
+    b1, b2 = b >> half, b & mask
+    q1, r = _div3n2n(a >> n, (a >> half) & mask, b, b1, b2, half)
+    q2, r = _div3n2n(r, a & mask, b, b1, b2, half)
+    if pad:
+        r >>= 1
+    return q1 << half | q2, r
+
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    if a12 >> n == b1:
+        q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = (r << n | a3) - q * b2
+    while r < 0:
+        q -= 1
+        r += b
+    return q, r
+
+
+def fast_divmod(a, b):
+    """非負整数 a, 正整数 b の divmod（a < b**2 の範囲で準二次）"""
+    n = b.bit_length()
+    if n <= _DIV_LIMIT or a >= b << n:
+        return divmod(a, b)
+    return _div2n1n(a, b, n)
+
+
+def _small_to_base(num, base):
+    if base == 10:
+        return str(num)
+    table = _table(base)
+    step = len(table)
+    parts = []
+    while num:
+        num, r = divmod(num, step)
+        parts.append(table[r])
+    return "".join(reversed(parts)).lstrip("0") or "0"
+
+
+def _top_level(num, base):
+    # num < power(base, k)**2 となる最小付近の k
+    k = 0
+    while num.bit_length() > 2 * (power(base, k).bit_length() - 1):
+        k += 1
+    return k
+
+
+def _chunks(num, base):
+    """num の base 表記を上位桁から順にチャンクとして yield する"""
+    if num.bit_length() <= _LEAF_BITS:
+        yield _small_to_base(num, base)
+        return
+    leaf = _LEAF[base]
+
+    def rec(n, k, pad):
+        if k < 0:
+            s = _small_to_base(n, base)
+            yield s.rjust(leaf, "0") if pad else s
+            return
+        hi, lo = fast_divmod(n, power(base, k))
+        if hi or pad:
+            yield from rec(hi, k - 1, pad)
+            yield from rec(lo, k - 1, True)
+        else:
+            yield from rec(lo, k - 1, False)
+
+    yield from rec(num, _top_level(num, base), False)
+
+
+def _check(num, base):
+    if num < 0:
+        raise ValueError("num must be non-negative")
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+
+
+def _binary_chunks(num):
+    # バイト列（文字列の 1/8 の大きさ）から _BINARY_STEP バイトずつ2進数にする
+    data = num.to_bytes((num.bit_length() + 7) // 8, "big")
+    yield format(int.from_bytes(data[:_BINARY_STEP], "big"), "b")
+    for i in range(_BINARY_STEP, len(data), _BINARY_STEP):
+        piece = data[i:i + _BINARY_STEP]
+        yield format(int.from_bytes(piece, "big"), "b").zfill(8 * len(piece))
+
+
+def iter_chunks(num, base):
+    """num の base 表記を上位桁から順に部分文字列で yield する
+
+    連結すると to_base(num, base) と同じになる。途中で止めれば残りの変換は行わない。
+    チャンクの長さはそろっていない（固定長が必要なら iter_digits）。
+    """
+    _check(num, base)
+    if base == 2:
+        if num.bit_length() <= 8 * _BINARY_STEP:
+            yield format(num, "b")
+        else:
+            yield from _binary_chunks(num)
+        return
+    yield from _chunks(num, base)
+
+
+def iter_digits(num, base, size=CHUNK_DIGITS, sign=""):
+    """num の base 表記を上位桁から size 文字ずつ yield する（最後だけ短くてよい）
+
+    全体の文字列を作らないので、巨大な数をファイルやソケットへ直接書き出せる。
+    sign は先頭に付ける文字列で、最初のチャンクの size 文字に含まれる。
+    """
+    if size < 1:
+        raise ValueError("size must be positive")
+    parts = [sign]
+    filled = len(sign)
+    for piece in iter_chunks(num, base):
+        parts.append(piece)
+        filled += len(piece)
+        if filled >= size:
+            buf = "".join(parts)
+            stop = len(buf) - len(buf) % size
+            for i in range(0, stop, size):
+                yield buf[i:i + size]
+            parts = [buf[stop:]]
+            filled = len(parts[0])
+    if filled:
+        yield "".join(parts)
+
+
+def iter_format(num, base, size=CHUNK_DIGITS):
+    """format_int(num, base) を iter_digits と同じく size 文字ずつ yield する"""
+    return iter_digits(abs(num), base, size, "-" if num < 0 else "")
+
+
+def to_base(num: int, base: int) -> str:
+    """Convert non-negative integer to string in given base."""
+    _check(num, base)
+    if base == 2:
+        return format(num, "b")
+    return "".join(_chunks(num, base))
+
+
+def format_int(num: int, base: int) -> str:
+    """符号付き整数を base 進数の文字列にする"""
+    sign = "-" if num < 0 else ""
+    return sign + to_base(abs(num), base)
+
+
+def _count_and_power(num, base):
+    # (桁数 n, base**(n-1)) を返す。2**(bl-1) <= num < 2**bl から n はほぼ決まる
+    bits = num.bit_length()
+    count = int((bits - 1) * math.log(2) / math.log(base)) + 1
+    p = base ** (count - 1)
+    while p * base <= num:
+        p *= base
+        count += 1
+    return count, p
+
+
+def digit_count(num: int, base: int) -> int:
+    """非負整数 num の base 進数での桁数（変換せずに求める）"""
+    _check(num, base)
+    if num == 0:
+        return 1
+    if base == 2:
+        return num.bit_length()
+    return _count_and_power(num, base)[0]
+
+
+def preview(num: int, base: int, head: int, tail: int):
+    """(上位 head 桁, 下位 tail 桁, 桁数) を全桁を変換せずに返す
+
+    桁数が head + tail 以下なら上位に全桁が入り、下位は空文字列になる。
+    """
+    _check(num, base)
+    if num.bit_length() <= _LEAF_BITS:
+        s = to_base(num, base)
+        if len(s) <= head + tail:
+            return s, "", len(s)
+        return s[:head], s[-tail:] if tail else "", len(s)
+    if base == 2:
+        count = num.bit_length()
+        if count <= head + tail:
+            return to_base(num, 2), "", count
+        top = num >> (count - head)
+        low = num & ((1 << tail) - 1)
+    else:
+        count, p = _count_and_power(num, base)
+        if count <= head + tail:
+            return to_base(num, base), "", count
+        top = num // (p // base ** (head - 1))
+        low = num % base ** tail
+    low_digits = to_base(low, base).rjust(tail, "0") if tail else ""
+    return to_base(top, base), low_digits, count
@@ -0,0 +1,358 @@
+"""ローカル計算サービス（asyncio）
+
+電卓と同じ計算（「a op b」や式、2/3/10/12 進数、小数の精度）を Unix ソケットか
+localhost の TCP で受け付ける。1行1つの JSON で要求し、1行1つの JSON で返す:
+
+    {"id": 1, "expr": "(1011 xor 110) * 21", "base": 3}
+    {"id": 2, "a": "1", "op": "/", "b": "10", "base": 3, "precision": 20}
+    {"id": 3, "cmd": "stats"}
+    -> {"id": 1, "result": "..."} / {"id": 2, "error": "..."} / {"id": 3, ...統計}
+
+同時に届いた小さな要求はキューから一度にまとめて取り出し、1回のスレッド呼び出しで
+計算する。巨大な数の要求は parallel のプロセスプールに回す。キューと接続ごとの
+処理中の要求数には上限があり、いっぱいになると読み込みを止めて送り手を待たせる。
+"stats" は要求数・バッチの大きさ・応答時間の p50/p99 を返す。
+
+    python -m basecalc.service --socket /tmp/basecalc.sock
+    python -m basecalc.service --port 8765
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import stat
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import cli, fixed, parallel
+from .radix import SUPPORTED_BASES
+
+# 一度にまとめて計算する要求の数
+BATCH_SIZE = 256
+# 計算待ちのキューの長さ
+QUEUE_SIZE = 4096
+# 1つの接続で同時に処理する要求の数
+MAX_INFLIGHT = 256
+# 1行の要求の最大バイト数
+MAX_LINE = 1 << 26
+
+# 要求の行の長さからオペランドのビット数を見積もるための1桁のビット数
+_BITS_PER_DIGIT = {base: math.log2(base) for base in SUPPORTED_BASES}
+
+
+def evaluate_request(line, base, precision):
+    """1つの要求を計算して (結果, エラーメッセージ) を返す（プロセスプールでも動く）"""
+    try:
+        result = cli.evaluate_line(line, base, precision)
+    except (ValueError, ZeroDivisionError) as e:
+        return None, str(e)
+    except Exception as e:
+        # 1つの要求の失敗を、同じバッチにまとめた他の要求に広げない
+        return None, f"internal error: {e}"
+    if result is None:
+        return None, "empty expression"
+    if not isinstance(result, str):
+        result = "".join(result)
+    return result, None
+
+
+def evaluate_batch(jobs):
+    return [evaluate_request(*job) for job in jobs]
+
+
+def _parse_request(request):
+    # (式の行, 基数, 精度) を返す
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    line = request.get("expr")
+    if line is None:
+        try:
+            line = f"{request['a']} {request['op']} {request['b']}"
+        except KeyError as e:
+            raise ValueError(f"missing field: {e.args[0]}") from None
+    # 3.0 == 3 や True == 1 も通ってしまうので、型まで見る
+    base = request.get("base", 10)
+    if type(base) is not int or base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base!r}")
+    precision = request.get("precision", 0)
+    if type(precision) is not int or precision < 0:
+        raise ValueError(f"invalid precision: {precision!r}")
+    if precision > fixed.MAX_PRECISION:
+        raise ValueError(f"precision too large: {precision} "
+                         f"(at most {fixed.MAX_PRECISION})")
+    return str(line), base, precision
+
+
+def _is_large(line, base, precision):
+    # 小数点以下 precision 桁を求めるには base**precision の大きさの数を扱う
+    digits = len(line) + precision
+    return digits * _BITS_PER_DIGIT[base] >= parallel.PARALLEL_BITS
+
+
+def percentile(sorted_values, q):
+    """昇順の列の q 分位点（最近傍順位法）"""
+    if not sorted_values:
+        return 0.0
+    k = max(math.ceil(q * len(sorted_values)) - 1, 0)
+    return sorted_values[k]
+
+
+class Stats:
+    """要求数・エラー数・バッチの大きさと、直近 window 件の応答時間"""
+
+    def __init__(self, window=100_000):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched = 0
+        self.large = 0
+
+    def record(self, seconds, error):
+        self.latencies.append(seconds)
+        self.requests += 1
+        if error:
+            self.errors += 1
+
+    def snapshot(self):
+        lat = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "large": self.large,
+            "batches": self.batches,
+            "mean_batch": self.batched / self.batches if self.batches else 0.0,
+            "p50_ms": percentile(lat, 0.50) * 1000,
+            "p99_ms": percentile(lat, 0.99) * 1000,
+            "max_ms": (lat[-1] if lat else 0.0) * 1000,
+        }
+
+
+class Service:
+    """要求をまとめて計算するサービス本体（ソケットとは独立して使える）"""
+
+    def __init__(self, batch_size=BATCH_SIZE, batch_delay=0.0,
+                 queue_size=QUEUE_SIZE, max_inflight=MAX_INFLIGHT,
+                 large_jobs=None):
+        self.batch_size = batch_size
+        # 最初の要求が届いてから、まとめる要求を待つ秒数（0 なら待たない）
+        self.batch_delay = batch_delay
+        self.queue_size = queue_size
+        self.max_inflight = max_inflight
+        self.large_jobs = large_jobs or 2 * parallel.workers()
+        self.stats = Stats()
+        self._queue = None
+        self._batcher = None
+        self._executor = None
+        self._large = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.queue_size)
+        self._large = asyncio.Semaphore(self.large_jobs)
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="basecalc")
+        self._batcher = asyncio.create_task(self._run_batches())
+
+    async def close(self):
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def dispatch(self, request):
+        """1つの要求（dict）に対する応答（dict）を返す"""
+        if isinstance(request, dict) and request.get("cmd") == "stats":
+            response = self.stats.snapshot()
+            response["queued"] = self._queue.qsize()
+        else:
+            response = await self.calculate(request)
+        if isinstance(request, dict) and "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def calculate(self, request):
+        t0 = time.perf_counter()
+        try:
+            job = _parse_request(request)
+        except ValueError as e:
+            result, error = None, str(e)
+        else:
+            if _is_large(*job):
+                result, error = await self._run_large(job)
+            else:
+                future = asyncio.get_running_loop().create_future()
+                # キューがいっぱいならここで待つ（バックプレッシャー）
+                await self._queue.put((job, future))
+                result, error = await future
+        self.stats.record(time.perf_counter() - t0, error is not None)
+        return {"result": result} if error is None else {"error": error}
+
+    async def _run_large(self, job):
+        async with self._large:
+            self.stats.large += 1
+            try:
+                future = parallel.get_pool().submit(evaluate_request, *job)
+                return await asyncio.wrap_future(future)
+            except Exception as e:
+                # プールが壊れたときなども、応答を返さずに相手を待たせない
+                return None, f"internal error: {e}"
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            if self.batch_delay:
+                await asyncio.sleep(self.batch_delay)
+            # その間に届いた要求をまとめて取り出す
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            jobs = [job for job, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor,
+                                                     evaluate_batch, jobs)
+            except Exception as e:
+                results = [(None, f"internal error: {e}")] * len(batch)
+            self.stats.batches += 1
+            self.stats.batched += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def handle(self, reader, writer):
+        """1つの接続の要求を読み、計算が終わった順に応答を書く"""
+        inflight = asyncio.Semaphore(self.max_inflight)
+        tasks = set()
+
+        def send(response):
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+
+        async def respond(request):
+            # 書き終わるまで枠を返さないので、読まない相手には新しい要求を読まない
+            try:
+                send(await self.dispatch(request))
+                await writer.drain()
+            finally:
+                inflight.release()
+
+        try:
+            while True:
+                # 処理中の要求が多すぎるときは、次の行を読まずに待つ
+                await inflight.acquire()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    send({"error": "request line too long"})
+                    break
+                if not line.strip():
+                    inflight.release()
+                    if not line:
+                        break
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    inflight.release()
+                    send({"error": f"invalid JSON: {e}"})
+                    continue
+                task = asyncio.create_task(respond(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(service, path=None, host="127.0.0.1", port=0):
+    """service の接続を受け付ける asyncio.Server を起動する
+
+    path を渡せば Unix ソケット、なければ host:port の TCP で待ち受ける。
+    """
+    if path is not None:
+        # 前に止めたサービスが残したソケットファイルは消してから作り直す
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        return await asyncio.start_unix_server(service.handle, path,
+                                               limit=MAX_LINE)
+    return await asyncio.start_server(service.handle, host, port,
+                                      limit=MAX_LINE)
+
+
+async def _run(args):
+    async with Service(batch_size=args.batch_size,
+                       batch_delay=args.batch_delay / 1000,
+                       queue_size=args.queue_size) as service:
+        server = await serve(service, args.socket, port=args.port)
+        where = args.socket or "127.0.0.1:%d" % args.port
+        print(f"basecalc service listening on {where}", file=sys.stderr)
+        # SIGINT / SIGTERM で待ち受けをやめ、ソケットファイルを片付ける
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        try:
+            async with server:
+                while True:
+                    try:
+                        await asyncio.wait_for(stop.wait(),
+                                               args.stats_interval or None)
+                        break
+                    except asyncio.TimeoutError:
+                        print(json.dumps(service.stats.snapshot()),
+                              file=sys.stderr)
+        finally:
+            if args.socket and os.path.exists(args.socket):
+                os.unlink(args.socket)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m basecalc.service",
+        description="Serve base 2/3/10/12 calculations as JSON lines.",
+    )
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--socket", help="Unix socket path")
+    where.add_argument("--port", type=int, default=8765,
+                       help="TCP port on 127.0.0.1 (default: 8765)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--batch-delay", type=float, default=0.0,
+                        help="milliseconds to wait for more requests per batch")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--stats-interval", type=float, default=0,
+                        help="print stats to stderr every N seconds")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
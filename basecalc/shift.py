@@ -0,0 +1,127 @@
+"""基数のべきによる掛け算・割り算と、桁のマスクの近道
+
+base 進数の表記のままなら、base**k（"1000…"）を掛けるのは末尾に 0 を k 個
+足すだけ、base**k での切り捨て除算は末尾の k 桁を落とすだけで済む。
+桁ごとの論理演算（digitwise、2進数ではビット演算）では、最大の桁が k 個並んだ
+base**k - 1（2進数なら "111…"）との AND は下位 k 桁を取り出す（mod base**k）、
+OR は下位 k 桁を最大の桁で埋める、XOR は下位 k 桁を1つずつ置き換えるだけになる。
+どれも int への変換も基数変換もせずに、結果の表記が求まる。
+
+    shift.calculate("multiply", "2101", "1000", 3)   # -> "2101000"
+    shift.calculate("divide", "1A3B", "100", 12)     # -> "1A"
+    shift.calculate("and", "110101", "111", 2)       # -> "101"
+"""
+from .radix import DIGITS
+from .validate import _ALLOWED
+
+# 基数ごとの XOR の表: 桁 d -> (d + 最大の桁) mod base
+_XOR = {
+    base: str.maketrans(DIGITS[:base], DIGITS[base - 1] + DIGITS[:base - 1])
+    for base in _ALLOWED
+}
+
+
+def _split(text, base):
+    # (負か, 先頭の 0 を除いた大文字の桁) を返す。base 進数の整数でなければ None
+    digits = text[1:] if text[:1] in ("-", "+") else text
+    if not digits or digits.encode("ascii", "replace").translate(
+            None, _ALLOWED[base]):
+        return None
+    digits = digits.lstrip("0") or "0"
+    if base == 12:
+        digits = digits.upper()
+    return text[:1] == "-" and digits != "0", digits
+
+
+def _sign(negative, digits):
+    return "-" + digits if negative else digits
+
+
+def power_exponent(digits):
+    """digits（先頭の 0 なし）が "1" の後に 0 が k 個並んだ base**k なら k"""
+    if digits[0] == "1" and digits.count("0") == len(digits) - 1:
+        return len(digits) - 1
+    return None
+
+
+def mask_length(digits, base):
+    """digits（先頭の 0 なし）が最大の桁が k 個並んだ base**k - 1 なら k"""
+    if digits.count(DIGITS[base - 1]) == len(digits):
+        return len(digits)
+    return None
+
+
+def _increment(digits, base):
+    # 桁の列に 1 を足す（繰り上がる末尾の最大の桁だけを書き換える）
+    top = DIGITS[base - 1]
+    body = digits.rstrip(top)
+    carry = "0" * (len(digits) - len(body))
+    if not body:
+        return "1" + carry
+    return body[:-1] + DIGITS[DIGITS.index(body[-1]) + 1] + carry
+
+
+def _multiply(x, y):
+    k = power_exponent(y[1])
+    if k is None:
+        return None
+    if x[1] == "0":
+        return "0"
+    return _sign(x[0] != y[0], x[1] + "0" * k)
+
+
+def _divide(x, y, base):
+    # 切り捨て除算（負の数は -∞ 方向）。割る数は正の base**k だけ
+    k = power_exponent(y[1])
+    if k is None or y[0]:
+        return None
+    negative, digits = x
+    if k == 0:
+        return _sign(negative, digits)
+    high = digits[:-k]
+    if not negative:
+        return high or "0"
+    low = digits[-k:]
+    if low.count("0") != len(low):
+        # 落とす桁が 0 でなければ、絶対値は切り上げになる
+        high = _increment(high, base)
+    return "-" + high
+
+
+def _mask(op, x, y, base):
+    if x[0] or y[0]:
+        # 負の数は2進数では2の補数、他の基数ではエラーなので int の計算に任せる
+        return None
+    k = mask_length(y[1], base)
+    if k is None:
+        return None
+    digits = x[1]
+    high = digits[:-k]
+    if op == "and":
+        # base**k による剰余と同じ
+        return digits[-k:].lstrip("0") or "0"
+    if op == "or":
+        return high + DIGITS[base - 1] * k
+    low = digits[-k:].rjust(k, "0").translate(_XOR[base])
+    return (high + low).lstrip("0") or "0"
+
+
+def calculate(op, a, b, base):
+    """base 進数の整数の表記 a, b の a op b を、桁の操作だけで求められればその表記
+
+    op は core.OPERATORS の名前。近道が使えない組み合わせ（不正な文字を含む場合も）
+    は None を返すので、呼び出し側は int で計算する。
+    """
+    if base not in _ALLOWED:
+        return None
+    x = _split(a, base)
+    y = _split(b, base)
+    if x is None or y is None:
+        return None
+    if op == "multiply":
+        return _multiply(x, y) or _multiply(y, x)
+    if op == "divide":
+        return _divide(x, y, base)
+    if op in ("and", "or", "xor"):
+        return _mask(op, x, y, base) or _mask(op, y, x, base)
+    return None
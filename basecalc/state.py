@@ -0,0 +1,95 @@
+"""電卓の入力状態
+
+GUI に依存しない「第1オペランド 演算子 第2オペランド」と直前の計算結果。
+整数の結果は int のまま持ち、続けて計算するときに文字列を解析し直さない。
+基数を変えても、整数の入力と結果は値を保ったまま新しい基数で表す。
+"""
+from .core import OPERATORS
+from .operand import Operand
+
+
+class CalcState:
+    """基数・入力中のオペランド・演算子・直前の結果をまとめて持つ"""
+
+    __slots__ = ("base", "operand1", "operand2", "operator", "editing_second",
+                 "last_result", "precision")
+
+    def __init__(self, base, precision=0):
+        self.base = base
+        # 直前の計算結果の Operand（なければ None）。編集はせず、recall で複製して使う
+        self.last_result = None
+        # 小数点以下の桁数（0 なら整数だけを扱い、割り算は切り捨て）
+        self.precision = precision
+        self.reset()
+
+    def operand(self, text=""):
+        """現在の基数・精度でオペランドを作る"""
+        op = Operand(self.base, text)
+        if self.precision:
+            op.set_precision(self.precision)
+        return op
+
+    def reset(self, keep_result=False):
+        """入力を消す。keep_result なら直前の結果を第1オペランドにする"""
+        self.operand1 = self.recall() if keep_result else self.operand()
+        self.operand2 = self.operand()
+        self.operator = None
+        self.editing_second = False
+
+    def store_result(self, value, text=None):
+        """計算結果を覚えて第1オペランドにする（text は base 進数での表記。なくてもよい）
+
+        int はそのまま持つ。小数の結果は表示した桁（text）までを値とする。
+        """
+        if isinstance(value, int):
+            self.store_operand(Operand.from_value(self.base, value, text))
+        else:
+            self.store_operand(self.operand(text))
+
+    def store_operand(self, operand):
+        """計算結果の Operand（別スレッドで作ったものなど）を覚えて第1オペランドにする"""
+        self.last_result = operand
+        self.reset(keep_result=True)
+
+    def recall(self):
+        """直前の結果を編集できるオペランドとして複製する（解析し直さない）"""
+        if self.last_result is None:
+            return self.operand()
+        return self.last_result.copy()
+
+    def rebase(self, base):
+        """基数を変える。整数の入力と直前の結果は値を保ったまま base 進数で持ち直す
+
+        小数は新しい基数で正確に表せるとは限らないので、入力も結果も消す。
+        """
+        held = (self.operand1, self.operand2, self.last_result)
+        self.base = base
+        if any(op is not None and op.point is not None for op in held):
+            self.last_result = None
+            self.reset()
+            return
+        self.operand1 = self.operand1.rebase(base)
+        self.operand2 = self.operand2.rebase(base)
+        if self.last_result is not None:
+            self.last_result = self.last_result.rebase(base)
+
+    @property
+    def target(self):
+        """桁の入力先のオペランド"""
+        return self.operand2 if self.editing_second else self.operand1
+
+    @property
+    def symbol(self):
+        return OPERATORS[self.operator].symbol
+
+    @property
+    def fractional(self):
+        """小数として計算するか（精度が設定され、割り算か小数の入力があるとき）"""
+        return self.precision > 0 and (
+            self.operator == "divide"
+            or self.operand1.fractional or self.operand2.fractional)
+
+    @property
+    def ready(self):
+        """計算できるだけの入力がそろっているか"""
+        return bool(self.operand1 and self.operator and self.operand2)
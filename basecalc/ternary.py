@@ -0,0 +1,215 @@
+"""平衡3進数（桁が −1, 0, +1 の3進数）
+
+3進数の負数を「絶対値に '-' を付ける」のではなく、各桁の符号で表す。
+桁（トリット）ごとの論理演算が負数でもそのまま意味を持つ:
+
+    a & b   桁ごとの min（Kleene の AND）
+    a | b   桁ごとの max（OR）
+    a ^ b   桁ごとの和 mod 3（繰り上がりのない足し算）
+    ~a      各桁の符号反転（NOT。-a と同じ）
+
+    x = BalancedTernary.from_int(-5)     # '-++'
+    str(x & BalancedTernary.parse("+-0"))
+
+トリットは下の桁から順に「桁 + 1」（0, 1, 2）を1バイトずつ並べた bytes で持つ。
+桁ごとの演算は2つの列を1つの整数 3a+b の列に重ねてから bytes.translate で
+表を引くので、Python のループを回さずに C の速度で全桁を処理する。
+"""
+from .parse import parse_int
+from .radix import digit_count, to_base
+
+# トリットの表記（'−' と 'T' も負の桁として読む）
+_TO_TEXT = bytes.maketrans(b"\x00\x01\x02", b"-0+")
+_FROM_TEXT = str.maketrans({"-": "\x00", "−": "\x00", "T": "\x00",
+                            "0": "\x01", "+": "\x02"})
+# 3進数の数字との相互変換（桁 + 1 がそのまま (n + (3**k-1)/2) の3進数の桁になる）
+_TO_DIGITS = bytes.maketrans(b"\x00\x01\x02", b"012")
+_FROM_DIGITS = bytes.maketrans(b"012", b"\x00\x01\x02")
+_NEGATE = bytes.maketrans(b"\x00\x02", b"\x02\x00")
+
+_ZERO = b"\x01"
+# 足し算で繰り上がりを一括処理する回数の上限（超えたら整数で計算する）
+_CARRY_ROUNDS = 32
+
+
+def _table(func):
+    # 3a+b（a, b は 桁 + 1）→ func(桁a, 桁b) + 1 の translate 表
+    table = bytearray(range(256))
+    for a in range(3):
+        for b in range(3):
+            table[3 * a + b] = func(a - 1, b - 1) + 1
+    return bytes(table)
+
+
+def _digit(s):
+    # 和 s (-2..2) の平衡3進数の1の位
+    return (s + 1) % 3 - 1
+
+
+_MIN = _table(min)
+_MAX = _table(max)
+_SUM_DIGIT = _table(lambda a, b: _digit(a + b))
+_SUM_CARRY = _table(lambda a, b: (a + b - _digit(a + b)) // 3)
+
+
+def _combine(a, b, table):
+    """2つのトリット列を桁ごとに table で組み合わせる（短い方は上を 0 で埋める）"""
+    n = max(len(a), len(b))
+    a, b = a.ljust(n, _ZERO), b.ljust(n, _ZERO)
+    # 各バイトが 3a+b (0..8) になるので繰り上がりは起きない
+    pairs = int.from_bytes(a, "little") * 3 + int.from_bytes(b, "little")
+    return pairs.to_bytes(n, "little").translate(table)
+
+
+def _strip(trits):
+    return trits.rstrip(_ZERO)
+
+
+class BalancedTernary:
+    """平衡3進数。不変で、int と同じように演算できる"""
+
+    __slots__ = ("_trits",)
+
+    def __init__(self, trits=b""):
+        # trits は下の桁からの「桁 + 1」の bytes（上の桁の 0 は除いておく）
+        self._trits = _strip(bytes(trits))
+
+    @classmethod
+    def from_int(cls, n):
+        """整数を平衡3進数にする（基数変換1回。桁数に対して二次時間にならない）"""
+        n = int(n)
+        if n == 0:
+            return cls()
+        # k 桁の平衡3進数は -(3**k-1)/2 .. (3**k-1)/2 を表す。
+        # n に (3**k-1)/2 を足した数の3進数の各桁が、そのまま「桁 + 1」になる
+        k = digit_count(2 * abs(n), 3)
+        text = to_base(n + (3 ** k - 1) // 2, 3).rjust(k, "0")
+        return cls(text[::-1].encode("ascii").translate(_FROM_DIGITS))
+
+    @classmethod
+    def parse(cls, text):
+        """'+-0' のような表記（上の桁から）を読む"""
+        raw = text.strip().translate(_FROM_TEXT)
+        if not raw or raw.strip("\x00\x01\x02"):
+            raise ValueError(f"invalid balanced ternary: {text!r}")
+        return cls(raw[::-1].encode("ascii"))
+
+    @classmethod
+    def _coerce(cls, other):
+        if isinstance(other, cls):
+            return other
+        if isinstance(other, int):
+            return cls.from_int(other)
+        return None
+
+    @property
+    def trits(self):
+        """下の桁からのトリット（-1, 0, 1）のタプル"""
+        return tuple(t - 1 for t in self._trits)
+
+    def __len__(self):
+        return len(self._trits)
+
+    def __int__(self):
+        k = len(self._trits)
+        if not k:
+            return 0
+        digits = self._trits[::-1].translate(_TO_DIGITS).decode("ascii")
+        return parse_int(digits, 3) - (3 ** k - 1) // 2
+
+    __index__ = __int__
+
+    def __str__(self):
+        if not self._trits:
+            return "0"
+        return self._trits[::-1].translate(_TO_TEXT).decode("ascii")
+
+    def __repr__(self):
+        return f"BalancedTernary({str(self)!r})"
+
+    def __bool__(self):
+        return bool(self._trits)
+
+    def __eq__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._trits == other._trits
+
+    def __hash__(self):
+        return hash(int(self))
+
+    def __neg__(self):
+        return BalancedTernary(self._trits.translate(_NEGATE))
+
+    __invert__ = __neg__
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        a, b = self._trits, other._trits
+        if not a or not b:
+            return other if not a else self
+        # 全桁の和と繰り上がりを一度に求め、繰り上がりがなくなるまで足し直す
+        digits = _combine(a, b, _SUM_DIGIT)
+        carries = _combine(a, b, _SUM_CARRY)
+        for _ in range(_CARRY_ROUNDS):
+            if carries.count(_ZERO) == len(carries):
+                return BalancedTernary(digits)
+            shifted = _ZERO + carries
+            digits, carries = (_combine(digits, shifted, _SUM_DIGIT),
+                               _combine(digits, shifted, _SUM_CARRY))
+        # 長い繰り上がりの連鎖（'++++' + '+' など）は整数で計算したほうが速い
+        return BalancedTernary.from_int(int(self) + int(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self + -other
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return BalancedTernary.from_int(int(self) * int(other))
+
+    __rmul__ = __mul__
+
+    def __lshift__(self, k):
+        """3**k 倍（下に 0 の桁を k 個足す）"""
+        if not self._trits:
+            return self
+        return BalancedTernary(_ZERO * k + self._trits)
+
+    def __rshift__(self, k):
+        """下の k 桁を捨てる（3**k で割って最も近い整数に丸める）"""
+        return BalancedTernary(self._trits[k:])
+
+    def _logic(self, other, table):
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return BalancedTernary(_combine(self._trits, other._trits, table))
+
+    def __and__(self, other):
+        return self._logic(other, _MIN)
+
+    def __or__(self, other):
+        return self._logic(other, _MAX)
+
+    def __xor__(self, other):
+        return self._logic(other, _SUM_DIGIT)
+
+    __rand__ = __and__
+    __ror__ = __or__
+    __rxor__ = __xor__
@@ -0,0 +1,196 @@
+"""NumPy による一括基数変換（int64 / uint64 に収まる値向け）
+
+値を1つずつ to_base に通す代わりに、配列全体に対して divmod を桁数回だけ
+繰り返す。NumPy が必要なので basecalc からは自動で import しない。
+
+    from basecalc import vectorized
+    vectorized.to_base_array(np.arange(10), 3)
+"""
+import numpy as np
+
+from .radix import DIGITS, SUPPORTED_BASES
+from .validate import DIGIT_VALUES
+
+# 数字文字（ASCII）の表と、その逆引き表（255 は数字でない）
+_CHARS = np.frombuffer(DIGITS.encode("ascii"), dtype=np.uint8)
+_VALUES = np.frombuffer(DIGIT_VALUES, dtype=np.uint8)
+_NUL, _MINUS, _PLUS = 0, ord("-"), ord("+")
+
+# 2**63 の各桁（int64 に収まるかの判定用）
+_LIMIT_DIGITS = {
+    base: _VALUES[np.frombuffer(np.base_repr(2 ** 63, base).encode("ascii"),
+                                dtype=np.uint8)]
+    for base in SUPPORTED_BASES
+}
+
+
+def _check_base(base):
+    if base not in SUPPORTED_BASES:
+        raise ValueError(f"unsupported base: {base}")
+
+
+def _magnitude(values):
+    """(絶対値の uint64 配列, 負数のマスク) を返す"""
+    values = np.asarray(values)
+    if values.dtype.kind == "u":
+        mag = values.astype(np.uint64, copy=False)
+        return mag, np.zeros(mag.shape, dtype=bool)
+    if values.dtype.kind not in "ib":
+        raise TypeError(f"integer array required, got {values.dtype}")
+    values = values.astype(np.int64, copy=False)
+    negative = values < 0
+    # 2の補数で絶対値を取る（INT64_MIN も正しく扱える）
+    mag = values.view(np.uint64).copy()
+    np.negative(mag, out=mag, where=negative)
+    return mag, negative
+
+
+def _width(mag, base):
+    top = int(mag.max()) if mag.size else 0
+    width = 1
+    while top >= base:
+        top //= base
+        width += 1
+    return width
+
+
+def digit_matrix(values, base, width=None):
+    """各値の絶対値を base 進数の桁（上位桁から）に分解した uint8 行列を返す
+
+    戻り値の形は (len(values), width)。width を省略すると最大値の桁数になる。
+    """
+    _check_base(base)
+    mag, _ = _magnitude(values)
+    mag = mag.ravel()
+    if width is None:
+        width = _width(mag, base)
+    if base == 2 and width <= 64:
+        # 2進数はビット列をそのまま展開する
+        bits = np.unpackbits(mag.astype(">u8").view(np.uint8).reshape(-1, 8),
+                             axis=1)
+        if bits[:, :64 - width].any():
+            raise OverflowError(f"values do not fit in {width} base-2 digits")
+        return bits[:, 64 - width:]
+    # 列ごとに書き込むので (width, n) で確保して転置を返す
+    digits = np.empty((width, mag.size), dtype=np.uint8)
+    q = mag.copy()
+    q2 = np.empty_like(q)
+    r = np.empty_like(q)
+    b = np.uint64(base)
+    for col in range(width - 1, -1, -1):
+        # divmod より floor_divide + 乗算の方が速い
+        np.floor_divide(q, b, out=q2)
+        np.multiply(q2, b, out=r)
+        np.subtract(q, r, out=r)
+        digits[col] = r
+        q, q2 = q2, q
+    if q.any():
+        raise OverflowError(f"values do not fit in {width} base-{base} digits")
+    return digits.T
+
+
+def to_base_array(values, base):
+    """整数配列を base 進数の文字列配列（負数は先頭に '-'）に変換する
+
+    メモリを抑えるため ASCII のバイト列配列（dtype S）で返す。
+    str の配列が必要なら .astype(str) する。
+    """
+    _check_base(base)
+    mag, negative = _magnitude(values)
+    shape = mag.shape
+    negative = negative.ravel()
+    digits = digit_matrix(mag, base)
+    n, width = digits.shape
+
+    # 最上位の 0 でない桁の位置（値が 0 なら最後の桁）
+    nonzero = digits != 0
+    lead = np.where(nonzero.any(axis=1), nonzero.argmax(axis=1), width - 1)
+
+    # 先頭に1列足した文字行列を作り、負数は最上位桁の直前に '-' を置く
+    chars = np.empty((n, width + 1), dtype=np.uint8)
+    chars[:, 0] = _NUL
+    chars[:, 1:] = _CHARS[digits]
+    del digits
+    rows = np.flatnonzero(negative)
+    chars[rows, lead[rows]] = _MINUS
+
+    # 文字列の開始位置ごとに行をまとめて左詰めにし、残りは NUL のまま
+    start = lead + 1 - negative
+    out = np.zeros((n, width + 1), dtype=np.uint8)
+    for s in np.unique(start):
+        rows = np.flatnonzero(start == s)
+        out[rows, :width + 1 - s] = chars[rows, s:]
+    return out.view(f"S{width + 1}").reshape(shape)
+
+
+def parse_array(strings, base):
+    """base 進数の文字列配列を int64 配列に変換する
+
+    範囲外の値は OverflowError、不正な文字列は最初の位置を添えて ValueError。
+    """
+    _check_base(base)
+    arr = np.asarray(strings)
+    shape = arr.shape
+    if arr.dtype.kind == "U":
+        arr = np.char.encode(arr, "ascii")
+    elif arr.dtype.kind != "S":
+        arr = np.asarray([str(s).encode("ascii") for s in arr.ravel()])
+    arr = np.ascontiguousarray(arr.ravel())
+    width = arr.dtype.itemsize
+    raw = arr.view(np.uint8).reshape(arr.size, width)
+
+    negative = raw[:, 0] == _MINUS
+    signed = negative | (raw[:, 0] == _PLUS)
+    vals = _VALUES[raw]
+    vals[signed, 0] = 0
+    present = raw != _NUL
+    present[signed, 0] = False
+    ndigits = present.sum(axis=1)
+
+    # 不正な文字を含む行と、空文字列（符号だけの行を含む）を弾く
+    bad = ((vals >= base) & present).any(axis=1) | (ndigits == 0)
+    if bad.any():
+        row = int(np.flatnonzero(bad)[0])
+        cells = (vals[row] >= base) & present[row]
+        where = f", position {int(cells.argmax())}" if cells.any() else ""
+        raise ValueError(f"invalid literal for base {base} at index {row}"
+                         f"{where}: {arr[row].decode('ascii', 'replace')!r}")
+
+    # 桁を右詰めにそろえる（開始列と桁数が同じ行ごとにまとめてコピー）
+    aligned = np.zeros((arr.size, width), dtype=np.uint8)
+    key = signed * (width + 1) + ndigits
+    for k in np.unique(key):
+        rows = np.flatnonzero(key == k)
+        start, n = divmod(int(k), width + 1)
+        aligned[rows, width - n:] = vals[rows, start:start + n]
+    del vals, present
+
+    # int64 に収まるか: 2**63 と同じ桁数の行だけ桁を辞書順に比べればよい
+    limit = _LIMIT_DIGITS[base]
+    L = len(limit)
+    nonzero = aligned != 0
+    significant = np.where(nonzero.any(axis=1), width - nonzero.argmax(axis=1), 0)
+    del nonzero
+    overflow = significant > L
+    wide = np.flatnonzero(significant == L)
+    if wide.size:
+        tail = aligned[wide, width - L:]
+        diff = tail != limit
+        first = diff.argmax(axis=1)
+        picked = tail[np.arange(wide.size), first]
+        cmp = np.where(diff.any(axis=1),
+                       np.where(picked > limit[first], 1, -1), 0)
+        overflow[wide] = np.where(negative[wide], cmp > 0, cmp >= 0)
+    if overflow.any():
+        row = int(np.flatnonzero(overflow)[0])
+        raise OverflowError(f"value at index {row} does not fit in int64")
+
+    # 右詰めなので先頭の 0 は値に影響しない
+    acc = np.zeros(arr.size, dtype=np.uint64)
+    b = np.uint64(base)
+    for col in range(max(width - L, 0), width):
+        np.multiply(acc, b, out=acc)
+        np.add(acc, aligned[:, col], out=acc, casting="unsafe")
+    result = acc.view(np.int64)
+    np.negative(result, out=result, where=negative)
+    return result.reshape(shape)
@@ -0,0 +1,49 @@
+"""桁ごとの論理演算のベンチマーク（要 NumPy）
+
+int どうしの digitwise.apply（基数変換を含む）と、詰めた桁の
+packed.apply（カーネルのみ）の時間を比べる。
+
+    python benchmarks/bench_digitwise.py [桁数]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basecalc import digitwise, packed  # noqa: E402
+from basecalc.parse import parse_int  # noqa: E402
+from basecalc.radix import DIGITS  # noqa: E402
+
+
+def random_int(digits, base, rng):
+    chars = np.frombuffer(DIGITS[:base].encode("ascii"), dtype=np.uint8)
+    text = chars[rng.integers(0, base, digits)].tobytes().decode("ascii")
+    return parse_int(text, base)
+
+
+def main():
+    digits = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    print(f"{'base':>4} {'op':>4} {'digits':>10} {'int[s]':>8} "
+          f"{'packed[s]':>10} {'bytes':>10}")
+    for base in (3, 10, 12):
+        x, y = random_int(digits, base, rng), random_int(digits, base, rng)
+        a = packed.PackedDigits.from_int(x, base)
+        b = packed.PackedDigits.from_int(y, base)
+        for op in ("and", "or", "xor"):
+            t = time.perf_counter()
+            r = digitwise.apply(op, x, y, base)
+            t_int = time.perf_counter() - t
+            t = time.perf_counter()
+            c = packed.apply(op, a, b)
+            t_packed = time.perf_counter() - t
+            assert int(c) == r
+            print(f"{base:>4} {op:>4} {digits:>10} {t_int:>8.3f} "
+                  f"{t_packed:>10.4f} {len(c.data):>10}")
+
+
+if __name__ == "__main__":
+    main()
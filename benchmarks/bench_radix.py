@@ -0,0 +1,71 @@
+"""基数変換のベンチマーク（旧来の to_base / int(s, base) との比較）
+
+    python benchmarks/bench_radix.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basecalc import radix  # noqa: E402
+from basecalc.parse import parse_int  # noqa: E402
+
+
+def naive_to_base(num, base):
+    """ver.2.0.0 までの to_base と同じ実装"""
+    if num == 0:
+        return "0"
+    digits = []
+    while num > 0:
+        d = num % base
+        digits.append(radix.DIGITS[d])
+        num //= base
+    return "".join(reversed(digits))
+
+
+def best_of(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def bench_to_base():
+    print(f"{'base':>4} {'bits':>8} {'naive[s]':>10} {'radix[s]':>10} {'speedup':>8}")
+    for base in (3, 10, 12):
+        for bits in (1_000, 10_000, 50_000, 200_000):
+            n = random.getrandbits(bits) | 1 << (bits - 1)
+            assert radix.to_base(n, base) == naive_to_base(n, base)
+            t_naive = best_of(naive_to_base, n, base)
+            t_fast = best_of(radix.to_base, n, base)
+            print(f"{base:>4} {bits:>8} {t_naive:>10.4f} {t_fast:>10.4f} "
+                  f"{t_naive / t_fast:>7.1f}x")
+
+
+def bench_parse():
+    # 比較のため int() の桁数制限を外す
+    sys.set_int_max_str_digits(0)
+    print(f"{'base':>4} {'digits':>8} {'int()[s]':>10} {'parse[s]':>10} {'speedup':>8}")
+    for base in (3, 10, 12):
+        for bits in (10_000, 100_000, 1_000_000):
+            s = radix.to_base(random.getrandbits(bits) | 1 << (bits - 1), base)
+            assert parse_int(s, base) == int(s, base)
+            t_int = best_of(int, s, base)
+            t_fast = best_of(parse_int, s, base)
+            print(f"{base:>4} {len(s):>8} {t_int:>10.4f} {t_fast:>10.4f} "
+                  f"{t_int / t_fast:>7.1f}x")
+
+
+def main():
+    random.seed(0)
+    bench_to_base()
+    print()
+    bench_parse()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""NumPy 一括変換のベンチマーク（要 NumPy）
+
+    python benchmarks/bench_vectorized.py [件数]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basecalc import vectorized  # noqa: E402
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    values = np.random.default_rng(0).integers(-2 ** 62, 2 ** 62, n)
+    print(f"{'base':>4} {'values':>10} {'to_base[s]':>11} {'parse[s]':>9}")
+    for base in (2, 3, 10, 12):
+        t = time.perf_counter()
+        strings = vectorized.to_base_array(values, base)
+        t_to = time.perf_counter() - t
+        t = time.perf_counter()
+        back = vectorized.parse_array(strings, base)
+        t_parse = time.perf_counter() - t
+        assert (back == values).all()
+        print(f"{base:>4} {n:>10} {t_to:>11.2f} {t_parse:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
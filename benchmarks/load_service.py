@@ -0,0 +1,118 @@
+"""basecalc.service の負荷テスト
+
+同じプロセスでサービスを起動し（--socket / --port を渡せば起動済みのサービスへ）、
+複数の接続から要求を送り続けて、クライアント側の応答時間の p50/p99 と
+スループット、サーバ側の統計（バッチの平均の大きさなど）を出す。
+
+    python benchmarks/load_service.py
+    python benchmarks/load_service.py -c 32 -n 2000 --large 0.01
+    python benchmarks/load_service.py --socket /tmp/basecalc.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from basecalc import service  # noqa: E402
+from basecalc.radix import DIGITS  # noqa: E402
+
+OPS = ("+", "-", "*", "/", "and", "or", "xor")
+
+
+def make_request(rng, i, large):
+    base = rng.choice((2, 3, 10, 12))
+    digits = 200_000 if rng.random() < large else rng.randint(1, 40)
+    a = "".join(rng.choice(DIGITS[:base]) for _ in range(digits))
+    b = "".join(rng.choice(DIGITS[:base]) for _ in range(rng.randint(1, 20)))
+    return {"id": i, "a": "1" + a, "op": rng.choice(OPS), "b": "1" + b,
+            "base": base}
+
+
+async def client(open_connection, requests, window, latencies):
+    reader, writer = await open_connection()
+    sent = {}
+    slots = asyncio.Semaphore(window)
+
+    async def receive():
+        for _ in requests:
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for request in requests:
+        await slots.acquire()
+        sent[request["id"]] = time.perf_counter()
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+    await receiver
+    writer.write(b'{"cmd": "stats"}\n')
+    stats = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return stats
+
+
+async def run(args):
+    rng = random.Random(0)
+    plans = [[make_request(rng, c * args.requests + i, args.large)
+              for i in range(args.requests)] for c in range(args.clients)]
+    svc = server = None
+    if args.socket:
+        def open_connection():
+            return asyncio.open_unix_connection(args.socket,
+                                                limit=service.MAX_LINE)
+    else:
+        port = args.port
+        if port is None:
+            svc = service.Service(batch_delay=args.batch_delay / 1000)
+            await svc.start()
+            server = await service.serve(svc)
+            port = server.sockets[0].getsockname()[1]
+
+        def open_connection():
+            return asyncio.open_connection("127.0.0.1", port,
+                                           limit=service.MAX_LINE)
+
+    latencies = []
+    t = time.perf_counter()
+    results = await asyncio.gather(*(client(open_connection, plan, args.window,
+                                            latencies) for plan in plans))
+    elapsed = time.perf_counter() - t
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+        await svc.close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"requests   {total} in {elapsed:.2f} s ({total / elapsed:,.0f} req/s)")
+    print(f"client p50 {service.percentile(latencies, 0.50) * 1000:.2f} ms, "
+          f"p99 {service.percentile(latencies, 0.99) * 1000:.2f} ms")
+    print("server    ", json.dumps(results[-1]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-c", "--clients", type=int, default=16)
+    parser.add_argument("-n", "--requests", type=int, default=1000,
+                        help="requests per client")
+    parser.add_argument("-w", "--window", type=int, default=32,
+                        help="requests in flight per client")
+    parser.add_argument("--large", type=float, default=0.0,
+                        help="fraction of 200k-digit requests")
+    parser.add_argument("--batch-delay", type=float, default=0.0,
+                        help="milliseconds (in-process service only)")
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--socket", help="connect to a running service")
+    where.add_argument("--port", type=int, help="connect to a running service")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""ver.2.0.0 の起動時間（import から最初の描画まで）
+
+毎回新しいインタプリタで offscreen 起動し、各段階までの時間の中央値を出す。
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py -n 20 -o startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_V2 = os.path.join(ROOT, "2,3,10,12進数電卓ver.2.0.0-Stable-2.py")
+
+STAGES = ("import_qt", "import_app", "qapplication", "construct", "first_paint")
+
+# 子プロセスで実行するスクリプト（各段階の経過秒数を JSON で出力する）
+_CHILD = r"""
+import importlib.util, json, sys, time
+t0 = time.perf_counter()
+stamps = {}
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+stamps["import_qt"] = time.perf_counter() - t0
+sys.path.insert(0, ROOT)
+spec = importlib.util.spec_from_file_location("calc_v2", APP_V2)
+calc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc)
+stamps["import_app"] = time.perf_counter() - t0
+app = QApplication([])
+stamps["qapplication"] = time.perf_counter() - t0
+win = calc.BaseCalculator()
+stamps["construct"] = time.perf_counter() - t0
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and "first_paint" not in stamps:
+            stamps["first_paint"] = time.perf_counter() - t0
+            QTimer.singleShot(0, app.quit)
+        return False
+
+watcher = FirstPaint()
+win.installEventFilter(watcher)
+win.show()
+app.exec_()
+print(json.dumps(stamps))
+"""
+
+
+def run_once():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    code = f"ROOT = {ROOT!r}\nAPP_V2 = {APP_V2!r}\n" + _CHILD
+    out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("-o", "--output", help="JSON file to write")
+    args = parser.parse_args(argv)
+
+    runs = [run_once() for _ in range(args.runs)]
+    report = {stage: statistics.median(r[stage] for r in runs)
+              for stage in STAGES}
+    prev = 0.0
+    print(f"{'stage':<14} {'total[ms]':>10} {'delta[ms]':>10}")
+    for stage in STAGES:
+        print(f"{stage:<14} {report[stage] * 1000:>10.1f} "
+              f"{(report[stage] - prev) * 1000:>10.1f}")
+        prev = report[stage]
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs, "median": report}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""ベンチマークスイート（結果は JSON で保存して比較する）
+
+基数変換・文字列解析・7つの演算を 10〜10**6 桁、2/3/10/12 進数で測り、
+基数のべきとの掛け算・割り算や桁のマスクを文字列のまま計算する時間も測る。
+PyQt5 があれば offscreen で1キー入力あたりの処理時間も測る。
+
+    python benchmarks/suite.py -o before.json
+    python benchmarks/suite.py -o after.json --compare before.json
+    python benchmarks/suite.py --quick          # 10**4 桁まで
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from basecalc import core, radix  # noqa: E402
+from basecalc.cache import conversions  # noqa: E402
+from basecalc.parse import parse_int  # noqa: E402
+
+APP_V1 = os.path.join(ROOT, "2,3,10,12進数電卓ver.1.0.0.py")
+APP_V2 = os.path.join(ROOT, "2,3,10,12進数電卓ver.2.0.0-Stable-2.py")
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+BASES = (2, 3, 10, 12)
+KEYSTROKE_SIZES = (10, 1_000, 10_000, 100_000)
+
+
+def measure(func):
+    """1回あたりの秒数（短い処理は回数を増やし、3回のうち最良を取る）"""
+    timer = timeit.Timer(func)
+    number, total = timer.autorange()
+    if total / number > 1.0:
+        return total / number
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def random_digits(digits, base, rng):
+    """先頭が 0 でない digits 桁のランダムな数"""
+    lo = base ** (digits - 1)
+    return lo + rng.randrange(base ** digits - lo)
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_conversions(sizes, rng, results):
+    for base in BASES:
+        for digits in sizes:
+            n = random_digits(digits, base, rng)
+            s = radix.to_base(n, base)
+            results.append({"name": "to_base", "base": base, "digits": digits,
+                            "seconds": measure(lambda: radix.to_base(n, base))})
+            results.append({"name": "parse", "base": base, "digits": digits,
+                            "seconds": measure(lambda: parse_int(s, base))})
+
+
+def bench_kivy_app(sizes, rng, results):
+    """ver.1.0.0 の validate_input / convert_from_decimal（Kivy がなければ飛ばす）"""
+    try:
+        app = load_module("calc_v1", APP_V1).BaseCalculatorApp()
+        app.build()
+    except ImportError as e:
+        print(f"skip ver.1.0.0: {e}", file=sys.stderr)
+        return
+    modes = {base: mode for mode, base in app.base_map.items()}
+
+    def convert(n):
+        # キャッシュに当たらないよう毎回空にする
+        conversions.clear()
+        return app.convert_from_decimal(n)
+
+    for base in BASES:
+        app.mode = modes[base]
+        for digits in sizes:
+            n = random_digits(digits, base, rng)
+            s = radix.to_base(n, base)
+            results.append({"name": "validate_input", "base": base,
+                            "digits": digits,
+                            "seconds": measure(lambda: app.validate_input(s))})
+            results.append({"name": "convert_from_decimal", "base": base,
+                            "digits": digits,
+                            "seconds": measure(lambda: convert(n))})
+
+
+def bench_operations(sizes, rng, results):
+    """7つの演算（結果の基数変換まで含む）"""
+    for base in BASES:
+        for digits in sizes:
+            x = random_digits(digits, base, rng)
+            y = random_digits(max(digits // 2, 1), base, rng)
+            for op in core.OPERATIONS:
+                results.append({
+                    "name": "operation", "op": op, "base": base,
+                    "digits": digits,
+                    "seconds": measure(
+                        lambda: radix.format_int(core.apply(op, x, y, base),
+                                                 base)),
+                })
+
+
+def bench_shifts(sizes, rng, results, k=8):
+    """base**k との掛け算・割り算と base**k - 1 との AND（core.calculate）"""
+    for base in BASES:
+        power = "1" + "0" * k
+        mask = radix.DIGITS[base - 1] * k
+        for digits in sizes:
+            x = radix.format_int(random_digits(digits, base, rng), base)
+            for op, y in (("multiply", power), ("divide", power), ("and", mask)):
+                results.append({
+                    "name": "shift", "op": op, "base": base, "digits": digits,
+                    "seconds": measure(lambda: core.calculate(x, op, y, base)),
+                })
+
+
+def bench_keystrokes(sizes, rng, results, keys=50):
+    """offscreen の BaseCalculator で on_button → update_display の時間を測る
+
+    大きな数の10進バーは別スレッドで変換されるので、ここで測るのは
+    GUI スレッドが止まっている時間（次のキー入力を受け付けるまで）。
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+        calc = load_module("calc_v2", APP_V2)
+        from basecalc.operand import Operand
+    except ImportError as e:
+        print(f"skip keystrokes: {e}", file=sys.stderr)
+        return
+    win = calc.BaseCalculator()
+    win.show()
+    for base in BASES:
+        win.set_base(base)
+        digit = str(base - 1) if base <= 10 else "B"
+        for digits in sizes:
+            win.on_button("clear")
+            win.state.operand1 = Operand.from_value(
+                base, random_digits(digits, base, rng))
+            win.update_display()
+            app.processEvents()
+            latencies = []
+            for i in range(keys):
+                # 桁の追加と削除を交互に行い、桁数を保つ
+                key = digit if i % 2 == 0 else "back"
+                t = time.perf_counter()
+                win.on_button(key)
+                app.processEvents()
+                latencies.append(time.perf_counter() - t)
+            latencies.sort()
+            results.append({
+                "name": "keystroke", "base": base, "digits": digits,
+                "seconds": statistics.median(latencies),
+                "p95": latencies[int(len(latencies) * 0.95) - 1],
+            })
+    win.close()
+
+
+def metadata():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True).stdout.strip()
+    except OSError:
+        rev = ""
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git": rev,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def _key(r):
+    return (r["name"], r.get("op", ""), r["base"], r["digits"])
+
+
+def compare(results, old_path):
+    with open(old_path, encoding="utf-8") as f:
+        old = {_key(r): r for r in json.load(f)["results"]}
+    print(f"{'name':<16} {'op':<9} {'base':>4} {'digits':>8} "
+          f"{'old[s]':>10} {'new[s]':>10} {'ratio':>6}")
+    for r in results:
+        prev = old.get(_key(r))
+        if prev is None:
+            continue
+        print(f"{r['name']:<16} {r.get('op', ''):<9} {r['base']:>4} "
+              f"{r['digits']:>8} {prev['seconds']:>10.6f} "
+              f"{r['seconds']:>10.6f} {r['seconds'] / prev['seconds']:>5.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="JSON file to write")
+    parser.add_argument("--compare", help="earlier JSON file to compare with")
+    parser.add_argument("--quick", action="store_true",
+                        help="only sizes up to 10**4 digits")
+    parser.add_argument("--only", nargs="*",
+                        choices=("conversions", "ver1", "operations",
+                                 "shifts", "keystrokes"))
+    args = parser.parse_args(argv)
+
+    # 比較対象の int() / str() が桁数制限で失敗しないようにする
+    sys.set_int_max_str_digits(0)
+    sizes = [s for s in SIZES if not args.quick or s <= 10_000]
+    key_sizes = [s for s in KEYSTROKE_SIZES if not args.quick or s <= 10_000]
+    rng = random.Random(0)
+    results = []
+    only = set(args.only or ("conversions", "ver1", "operations", "shifts",
+                             "keystrokes"))
+    if "conversions" in only:
+        bench_conversions(sizes, rng, results)
+    if "ver1" in only:
+        bench_kivy_app(sizes, rng, results)
+    if "operations" in only:
+        bench_operations(sizes, rng, results)
+    if "shifts" in only:
+        bench_shifts(sizes, rng, results)
+    if "keystrokes" in only:
+        bench_keystrokes(key_sizes, rng, results)
+
+    report = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    if args.compare:
+        compare(results, args.compare)
+    elif not args.output:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""多倍長整数のバックエンド: インストールされているものすべてで basecalc.conformance を通す"""
+import pytest
+
+from basecalc import backend
+from basecalc.conformance import conformance
+
+
+@pytest.fixture(params=list(backend.BACKENDS))
+def impl(request):
+    name = request.param
+    if name not in backend.available():
+        pytest.skip(f"{name} is not installed")
+    return backend._create(name)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_conformance(impl, seed):
+    assert conformance(impl, seed) == []
+
+
+def test_use_switches_and_restores(monkeypatch):
+    monkeypatch.delenv(backend.ENV_VAR, raising=False)
+    before = backend.get().name
+    try:
+        assert backend.use("python").name == "python"
+        assert backend.format_int(-255, 12) == "-193"
+        with pytest.raises(ValueError, match="unknown backend"):
+            backend.use("nope")
+    finally:
+        backend.use(before if before != backend.available()[0] else None)
@@ -0,0 +1,51 @@
+"""変換結果のキャッシュ（大きさの数え方と追い出し）"""
+import random
+
+from basecalc.cache import ConversionCache
+from basecalc.radix import format_int
+
+
+def _number(seed, bits=4000):
+    return random.Random(seed).getrandbits(bits) | 1 << (bits - 1)
+
+
+def _cost(value, text):
+    return len(text) + value.bit_length() // 8
+
+
+def test_store_counts_the_pair_once():
+    cache = ConversionCache()
+    value = _number(1)
+    text = format_int(value, 10)
+    cache.store(value, 10, text)
+    assert cache.stats()["entries"] == 2
+    assert cache.size == _cost(value, text)
+    # 同じ組を登録し直しても増えない
+    cache.store(value, 10, text)
+    assert cache.size == _cost(value, text)
+    assert cache.lookup(value, 10) == text
+    assert cache.parse_int(text, 10) == value
+
+
+def test_parse_int_and_format_int_share_the_entry():
+    cache = ConversionCache()
+    value = _number(2)
+    text = format_int(value, 3)
+    assert cache.parse_int(text, 3) == value
+    assert cache.size == _cost(value, text)
+    assert cache.format_int(value, 3) == text
+    assert cache.hits == 1
+
+
+def test_evicts_oldest_pairs_within_budget():
+    values = [_number(seed) for seed in range(10)]
+    texts = [format_int(v, 12) for v in values]
+    one = _cost(values[0], texts[0])
+    cache = ConversionCache(max_digits=3 * one + one // 2)
+    for value, text in zip(values, texts):
+        cache.store(value, 12, text)
+        assert cache.size <= cache.max_digits
+    assert cache.lookup(values[-1], 12) == texts[-1]
+    assert cache.lookup(values[0], 12) is None
+    cache.clear()
+    assert cache.size == 0 and cache.stats()["entries"] == 0
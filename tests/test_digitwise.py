@@ -0,0 +1,47 @@
+"""基数ごとの桁単位の論理演算"""
+import random
+
+import pytest
+
+from basecalc import digitwise, radix
+
+
+def _reference(op, x, y, base):
+    a, b = radix.to_base(x, base), radix.to_base(y, base)
+    n = max(len(a), len(b))
+    func = digitwise.LOGIC[op]
+    digits = "".join(
+        radix.DIGITS[func(int(p, base), int(q, base), base)]
+        for p, q in zip(a.rjust(n, "0"), b.rjust(n, "0")))
+    return int(digits, base)
+
+
+@pytest.mark.parametrize("base", [3, 10, 12])
+@pytest.mark.parametrize("op", ["and", "or", "xor"])
+def test_matches_digit_by_digit(base, op):
+    rng = random.Random(f"{base}{op}")
+    for bits in (1, 10, 100, 3000):
+        x, y = rng.getrandbits(bits), rng.getrandbits(bits // 2 + 1)
+        assert digitwise.apply(op, x, y, base) == _reference(op, x, y, base)
+
+
+def test_examples():
+    assert digitwise.apply("xor", 5, 7, 10) == 2
+    assert digitwise.apply("and", 5, 7, 3) == 4
+    assert digitwise.apply("or", int("1A", 12), int("B3", 12), 12) == int("BA", 12)
+
+
+def test_base2_is_bitwise():
+    for x, y in ((5, 3), (-6, 11), (0, -1)):
+        assert digitwise.apply("and", x, y, 2) == x & y
+        assert digitwise.apply("or", x, y, 2) == x | y
+        assert digitwise.apply("xor", x, y, 2) == x ^ y
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        digitwise.apply("and", -1, 2, 3)
+    with pytest.raises(ValueError):
+        digitwise.apply("nand", 1, 2, 3)
+    with pytest.raises(ValueError):
+        digitwise.apply("and", 1, 2, 7)
@@ -0,0 +1,50 @@
+"""式の字句解析・評価"""
+import pytest
+
+from basecalc import digitwise, expr
+from basecalc.validate import InvalidDigitError
+
+
+def test_tokenize():
+    assert list(expr.tokenize("(1011 XOR 110) * 21", 3)) == [
+        ("(", None, 0), ("num", 31, 1), ("op", "xor", 6), ("num", 12, 10),
+        (")", None, 13), ("op", "multiply", 15), ("num", 7, 17),
+    ]
+
+
+def test_tokenize_prefixed_literals_and_names():
+    assert list(expr.tokenize("3#21 + x - 1A", 12)) == [
+        ("num", 7, 0), ("op", "add", 5), ("name", "x", 7),
+        ("op", "subtract", 9), ("num", 22, 11),
+    ]
+
+
+def test_tokenize_errors():
+    with pytest.raises(ValueError, match=r"unexpected character '\$' at 2"):
+        list(expr.tokenize("1 $ 2"))
+    with pytest.raises(ValueError, match="unsupported base.* at 4$"):
+        list(expr.tokenize("1 + 7#1"))
+    with pytest.raises(ValueError, match="precision"):
+        list(expr.tokenize("0.5"))
+
+
+@pytest.mark.parametrize("text, base, position", [
+    ("1 + 12", 2, 5),
+    ("101 * 3#1032", 2, 10),
+    ("(-1A0 + 1)", 10, 3),
+])
+def test_tokenize_invalid_digit_position(text, base, position):
+    with pytest.raises(InvalidDigitError) as info:
+        list(expr.tokenize(text, base))
+    assert info.value.position == position
+    assert str(info.value).endswith(f" at {position}")
+    assert str(info.value).count(" at ") == 1
+
+
+def test_evaluate():
+    assert expr.evaluate("(1011 xor 110) * 21", base=3) == (
+        digitwise.apply("xor", 31, 12, 3) * 7)
+    assert expr.evaluate("1 + 2 * 3") == 7
+    assert expr.evaluate("-(x + 1) // 2", x=4) == -3
+    e = expr.compile("x * 10", base=2)
+    assert list(e.evaluate_many({"x": v} for v in range(3))) == [0, 2, 4]
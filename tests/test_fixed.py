@@ -0,0 +1,36 @@
+"""基数小数"""
+from fractions import Fraction
+
+import pytest
+
+from basecalc import fixed
+
+
+@pytest.mark.parametrize("a, op, b, base, precision, want", [
+    ("1", "/", "3", 10, 5, "0.33333"),
+    ("1", "/", "10", 3, 4, "0.1"),
+    ("-1", "/", "3", 10, 3, "-0.333"),
+    ("0.1", "+", "0.2", 3, 3, "1"),
+    ("1", "/", "2", 12, 2, "0.6"),
+    ("0.6", "*", "2", 12, 2, "1"),
+])
+def test_calculate(a, op, b, base, precision, want):
+    assert fixed.calculate(a, op, b, base, precision) == want
+
+
+def test_parse_and_format():
+    assert fixed.parse_value("-0.6", 12) == Fraction(-1, 2)
+    assert fixed.parse_value("10.1", 2) == Fraction(5, 2)
+    assert fixed.format_value(Fraction(-1, 2), 10, 4) == "-0.5"
+    assert fixed.format_value(Fraction(1, 3), 3, 4) == "0.1"
+    assert fixed.format_value(7, 2, 4) == "111"
+
+
+def test_large_precision_is_exact():
+    text = fixed.format_value(Fraction(1, 7), 10, 3000)
+    assert text == "0." + ("142857" * 500)
+
+
+def test_divide_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        fixed.calculate("1", "/", "0", 10, 3)
@@ -0,0 +1,73 @@
+"""基数変換（radix.to_base / format_int / iter_format と parse.parse_int）"""
+import random
+
+import pytest
+
+from basecalc import parse, radix
+from basecalc.validate import InvalidDigitError
+
+BASES = radix.SUPPORTED_BASES
+
+
+@pytest.mark.parametrize("base", BASES)
+@pytest.mark.parametrize("bits", [1, 60, 1000, 5000, 40000])
+def test_round_trip(base, bits):
+    rng = random.Random(bits * base)
+    for _ in range(3):
+        num = rng.getrandbits(bits)
+        text = radix.to_base(num, base)
+        assert text == "0" or not text.startswith("0")
+        assert parse.parse_int(text, base) == num
+        assert parse.parse_int("-" + text, base) == -num
+        assert radix.format_int(-num, base) == ("-" + text if num else "0")
+        assert radix.digit_count(num, base) == len(text)
+
+
+@pytest.mark.parametrize("base", BASES)
+def test_small_values(base):
+    for num in range(200):
+        assert int(radix.to_base(num, base), base) == num
+
+
+@pytest.mark.parametrize("base", BASES)
+def test_iter_format_joins_to_format_int(base):
+    num = -random.Random(base).getrandbits(20000)
+    chunks = list(radix.iter_format(num, base, 1000))
+    assert "".join(chunks) == radix.format_int(num, base)
+    assert all(len(c) == 1000 for c in chunks[:-1])
+
+
+@pytest.mark.parametrize("base", BASES)
+@pytest.mark.parametrize("bits", [5, 1999, 2000, 30000])
+@pytest.mark.parametrize("head, tail", [(3, 3), (10, 0), (1500, 1500)])
+def test_preview_matches_full_text(base, bits, head, tail):
+    num = (1 << (bits - 1)) | random.Random(bits).getrandbits(bits - 1)
+    text = radix.to_base(num, base)
+    top, low, count = radix.preview(num, base, head, tail)
+    assert count == len(text)
+    if len(text) <= head + tail:
+        assert (top, low) == (text, "")
+    else:
+        assert top == text[:head]
+        assert low == (text[-tail:] if tail else "")
+
+
+def test_parse_int_accepts_sign_zeros_and_lowercase():
+    assert parse.parse_int("+00ab", 12) == 131
+    assert parse.parse_int("-0", 3) == 0
+
+
+def test_parse_int_reports_position():
+    with pytest.raises(InvalidDigitError) as info:
+        parse.parse_int("-1012", 2)
+    assert info.value.position == 4
+    for bad in ("", "-", "+"):
+        with pytest.raises(ValueError):
+            parse.parse_int(bad, 10)
+
+
+def test_unsupported_base_and_negative():
+    with pytest.raises(ValueError):
+        radix.to_base(10, 7)
+    with pytest.raises(ValueError):
+        radix.to_base(-1, 10)
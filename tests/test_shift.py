@@ -0,0 +1,46 @@
+"""shift の近道が core.evaluate（int で計算）と同じ結果になるか"""
+import random
+
+import pytest
+
+from basecalc import core, radix, shift
+
+
+def _digits(rng, base, n):
+    return radix.DIGITS[1:base][rng.randrange(base - 1)] + "".join(
+        rng.choice(radix.DIGITS[:base]) for _ in range(n - 1))
+
+
+@pytest.mark.parametrize("base", radix.SUPPORTED_BASES)
+@pytest.mark.parametrize("op", ["multiply", "divide", "and", "or", "xor"])
+def test_matches_core(base, op):
+    rng = random.Random(f"{base}{op}")
+    top = radix.DIGITS[base - 1]
+    for _ in range(50):
+        a = _digits(rng, base, rng.randrange(1, 40))
+        k = rng.randrange(0, 50)
+        b = "1" + "0" * k if op in ("multiply", "divide") else top * (k + 1)
+        for sa in ("", "-"):
+            for x, y in ((sa + a, b), (b, sa + a)):
+                if op == "divide" and y != b:
+                    continue
+                if op in ("and", "or", "xor") and sa:
+                    # 負の数（2進数では2の補数）は int の計算に任せる
+                    assert shift.calculate(op, x, y, base) is None
+                    continue
+                text = shift.calculate(op, x, y, base)
+                assert text is not None, (op, x, y)
+                assert text == radix.format_int(core.evaluate(x, op, y, base), base)
+
+
+def test_falls_back_when_no_shortcut():
+    assert shift.calculate("multiply", "12", "21", 3) is None
+    assert shift.calculate("add", "1", "1", 2) is None
+    assert shift.calculate("multiply", "1Z", "10", 12) is None
+    assert shift.calculate("multiply", "1", "10", 7) is None
+
+
+def test_core_calculate_uses_shift():
+    assert core.calculate("2101", "*", "1000", 3) == "2101000"
+    assert core.calculate("-1A3B", "/", "100", 12) == "-1B"
+    assert core.calculate("110101", "and", "111", 2) == "101"
@@ -0,0 +1,54 @@
+"""平衡3進数"""
+import random
+
+import pytest
+
+from basecalc.ternary import BalancedTernary
+
+
+@pytest.mark.parametrize("n", [0, 1, -1, 2, 8, -5, 3 ** 40, -(3 ** 40) + 7])
+def test_int_round_trip(n):
+    t = BalancedTernary.from_int(n)
+    assert int(t) == n
+    assert BalancedTernary.parse(str(t)) == t
+
+
+def test_examples():
+    assert str(BalancedTernary.from_int(8)) == "+0-"
+    assert str(BalancedTernary.from_int(-5)) == "-++"
+    assert str(BalancedTernary.from_int(0)) == "0"
+    assert str(BalancedTernary.from_int(-5) & BalancedTernary.parse("+-0")) == "--0"
+
+
+def test_arithmetic_matches_int():
+    rng = random.Random(3)
+    for bits in (3, 60, 2000):
+        x = rng.getrandbits(bits) - (1 << (bits - 1))
+        y = rng.getrandbits(bits) - (1 << (bits - 1))
+        a, b = BalancedTernary.from_int(x), BalancedTernary.from_int(y)
+        assert int(a + b) == x + y
+        assert int(a - b) == x - y
+        assert int(a * b) == x * y
+        assert int(-a) == -x
+        assert int(a << 3) == x * 27
+
+
+def _tritwise(func, a, b):
+    # 桁（-1, 0, +1）ごとに func を適用した結果を int で返す
+    value = {"-": -1, "0": 0, "+": 1}
+    n = max(len(a), len(b))
+    result = 0
+    for p, q in zip(a.rjust(n, "0"), b.rjust(n, "0")):
+        result = result * 3 + func(value[p], value[q])
+    return result
+
+
+def test_logic_is_tritwise():
+    def sum_trit(p, q):
+        return (p + q + 1) % 3 - 1
+
+    for x, y in ((8, -5), (-40, 13), (1000, -999)):
+        a, b = BalancedTernary.from_int(x), BalancedTernary.from_int(y)
+        assert int(a & b) == _tritwise(min, str(a), str(b))
+        assert int(a | b) == _tritwise(max, str(a), str(b))
+        assert int(a ^ b) == _tritwise(sum_trit, str(a), str(b))